@@ -1,83 +1,427 @@
 # OPC UA Control Panel
 # - PyQt5 GUI to monitor and set digital/analog signals for the ion source and optics
-# - Communicates with a PLC via OPC UA (python-opcua Client)
-# - Groups: digital toggles, oven current/temperature, source voltages, ion optics
+# - Communicates with a PLC via OPC UA (python-opcua Client) from a worker QThread,
+#   so network latency never blocks the GUI
+# - Groups: digital toggles, then tabs for oven current/temperature, source voltages and
+#   ion optics (a tab's widgets are created the first time it is shown)
 # - Each analog control = slider + step-size selector + value readout
-# - 1 Hz auto-refresh reads values; optional logging writes a tab-separated file
+# - Indicator values are pushed by an OPC UA subscription (1 Hz polling only as fallback);
+#   optional logging writes a tab-separated file once per second
 # - “Delta Voltage” = Einzellinse - Extraction (kept consistent when either changes)
 
 import sys
-from datetime import datetime
-from opcua import Client
+import threading
+import time
+from functools import partial
+from opcua import Client, ua
 from opcua.ua import VariantType
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QCheckBox,
                             QGroupBox, QFormLayout, QFileDialog, QComboBox,
-                            QSlider, QSizePolicy, QFrame)
-from PyQt5.QtCore import Qt, QTimer
+                            QSlider, QSizePolicy, QFrame, QTabWidget)
+from PyQt5.QtCore import Qt, QTimer, QObject, QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QFont, QColor, QPalette
 
+# Group box look for the whole panel, applied once to the application instead of parsing
+# one stylesheet per group; groups differ only in background color (selected by objectName).
+PANEL_STYLESHEET = """
+    QGroupBox#boolGroup, QGroupBox#tempGroup, QGroupBox#sourceGroup, QGroupBox#opticsGroup {
+        border: 1px solid gray;
+        border-radius: 3px;
+        margin-top: 10px;
+    }
+    QGroupBox#boolGroup { background-color: #f0f8ff; }
+    QGroupBox#tempGroup { background-color: #fff0f5; }
+    QGroupBox#sourceGroup { background-color: #f0fff0; }
+    QGroupBox#opticsGroup { background-color: #f5f0ff; }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 3px;
+    }
+    QFrame#sep {
+        min-height: 1px;
+        max-height: 1px;
+        border: none;
+        background-color: #888;
+    }
+"""
+
 
 class ScrollableSlider(QSlider):
     # Slider that uses mouse wheel + a per-control step selector to adjust in user-chosen ticks.
-    # The parent control dictionary is attached to slider.control by create_slider_control().
+    # The owning control dictionary is attached to slider.control by create_slider_control().
     def __init__(self, parent=None):
         super().__init__(Qt.Horizontal, parent)
         self.control = None  # set by create_slider_control
 
     def wheelEvent(self, event):
-        # Wheel delta -> +/- ticks; ticks derive from (step size * multiplier) with min 1 tick.
+        # Wheel delta -> +/- ticks; the tick count per step is cached in control['step_ticks'].
         if not self.control:
             return
 
         delta = event.angleDelta().y()
-        step_selector = self.control['step_selector']
-        multiplier = self.control['multiplier']
-
-        step_val = step_selector.currentData()
-        if step_val is None:
-            # Fallback if userData missing: parse visible text (supports comma decimal).
-            step_text = step_selector.currentText().replace(",", ".")
-            step_val = float(step_text)
-
-        ticks = max(1, round(step_val * multiplier))
+        ticks = self.control['step_ticks']
         new_val = self.value() + (ticks if delta > 0 else -ticks)
         self.setValue(min(self.maximum(), max(self.minimum(), new_val)))
         event.accept()
 
 
+class DataChangeHandler(QObject):
+    # Subscription handler: python-opcua calls datachange_notification from its own thread,
+    # so the value is forwarded as a Qt signal (queued onto the GUI thread) keyed by NodeId string.
+    data_changed = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.node_ids = {}  # ua.NodeId (possibly registered) -> NodeId string used by the panel
+
+    def datachange_notification(self, node, val, data):
+        node_id = self.node_ids.get(node.nodeid)
+        if node_id is not None:
+            self.data_changed.emit(node_id, val)
+
+
+class OpcWorker(QObject):
+    # Owns the OPC UA client and does all network I/O (connect, register, batched read,
+    # subscription, writes) on its own QThread. The panel only talks to it through queued
+    # signals (plus the thread-safe post_writes), and results come back as signals handled
+    # on the GUI thread.
+    connection_changed = pyqtSignal(bool, bool)  # connected, subscribed
+    values_read = pyqtSignal(dict)               # NodeId string -> value (one batched read)
+    write_failed = pyqtSignal(str, str)          # NodeId string, error text (per failed write)
+    writes_done = pyqtSignal(object)             # NodeId string -> (value, write number, accepted) per batch
+    status = pyqtSignal(str)
+    writes_pending = pyqtSignal()                # internal: drain the write buffer in this thread
+
+    KEEPALIVE_MS = 5000
+    REQUEST_TIMEOUT_S = 2       # per-request timeout, so a dead or unreachable PLC fails fast
+    SESSION_TIMEOUT_MS = 30000  # the server drops our session this long after we vanish
+    RETRY_MS = 1000             # first reconnect delay, doubled after every failed attempt
+    MAX_RETRY_MS = 30000
+
+    def __init__(self, url, node_ids):
+        super().__init__()
+        self.url = url
+        self.node_ids = node_ids  # every node the panel reads or writes
+
+        self.client = None
+        self._reg = {}            # NodeId string -> registered Node
+        self._read_nodes = []     # same order as node_ids
+        self._sub = None
+        self.sub_handler = DataChangeHandler(self)
+        self._keepalive_timer = None  # created on first connect (must live in the worker thread)
+        self._retry_timer = None
+        self._retry_ms = self.RETRY_MS
+
+        # Latest-wins write buffer: NodeId string -> (value, VariantType, write number), shared
+        # with the GUI thread.
+        self._pending_writes = {}
+        self._write_lock = threading.Lock()
+        self.writes_pending.connect(self.write_values)
+
+    @pyqtSlot()
+    def connect_opc(self):
+        # (Re)connect, register nodes, push one full read, then subscribe to changes.
+        if self._retry_timer:
+            self._retry_timer.stop()  # a manual reconnect replaces a pending retry
+        try:
+            self.close_session()
+            self.client = Client(self.url, timeout=self.REQUEST_TIMEOUT_S)
+            self.client.session_timeout = self.SESSION_TIMEOUT_MS
+            self.client.connect()
+            self.register_opc_nodes()
+            self.status.emit("Status: Connected")
+            self.connection_changed.emit(True, False)
+            self.read_all()
+            subscribed = self.start_subscription()
+            self.connection_changed.emit(True, subscribed)
+            self.start_keepalive()
+            self._retry_ms = self.RETRY_MS
+        except Exception as e:
+            self.close_session()
+            self.connection_changed.emit(False, False)
+            self.status.emit(f"Status: Connection failed - {str(e) or type(e).__name__}, "
+                             f"retrying in {self._retry_ms // 1000} s")
+            self.schedule_reconnect()
+
+    def schedule_reconnect(self):
+        # Retry a failed connect from a single-shot timer with exponential backoff
+        # (RETRY_MS doubling up to MAX_RETRY_MS), so an absent PLC is not hammered.
+        if self._retry_timer is None:
+            self._retry_timer = QTimer(self)
+            self._retry_timer.setSingleShot(True)
+            self._retry_timer.timeout.connect(self.connect_opc)
+        self._retry_timer.start(self._retry_ms)
+        self._retry_ms = min(self._retry_ms * 2, self.MAX_RETRY_MS)
+
+    def start_keepalive(self):
+        # Every KEEPALIVE_MS read the server time so the channel stays warm and a dead link is
+        # noticed here, not on the user's next slider move.
+        if self._keepalive_timer is None:
+            self._keepalive_timer = QTimer(self)
+            self._keepalive_timer.timeout.connect(self.keepalive)
+            self._keepalive_timer.start(self.KEEPALIVE_MS)
+
+    @pyqtSlot()
+    def keepalive(self):
+        if not self.client:
+            return  # reconnect is pending on the retry timer
+        try:
+            self.client.get_node(ua.ObjectIds.Server_ServerStatus_CurrentTime).get_value()
+        except Exception as e:
+            self.close_session()
+            self.connection_changed.emit(False, False)
+            self.status.emit(f"Status: Connection lost - {str(e) or type(e).__name__}, reconnecting")
+            self.connect_opc()
+
+    def register_opc_nodes(self):
+        # Register every node once, so the server resolves the string NodeIds a single time and all
+        # later reads/writes use the returned handles. read_all fetches the same list with one
+        # Read service call via client.get_values().
+        nodes = [self.client.get_node(node_id) for node_id in self.node_ids]
+        try:
+            nodes = self.client.register_nodes(nodes)
+        except Exception:
+            pass  # server without RegisterNodes support: keep the plain string NodeIds
+        self._reg = dict(zip(self.node_ids, nodes))
+        self._read_nodes = nodes
+
+    def unregister_opc_nodes(self):
+        # Release registered handles before the session goes away (errors ignored on a dead link).
+        nodes = [node for node in self._reg.values() if getattr(node, 'basenodeid', None) is not None]
+        self._reg = {}
+        self._read_nodes = []
+        if nodes:
+            try:
+                self.client.unregister_nodes(nodes)
+            except Exception:
+                pass
+
+    def start_subscription(self):
+        # One subscription with a MonitoredItem per node; the server pushes only changed values.
+        # If the server refuses, the panel keeps polling read_all at 1 Hz instead.
+        try:
+            self.sub_handler.node_ids = {node.nodeid: node_id
+                                         for node_id, node in zip(self.node_ids, self._read_nodes)}
+            self._sub = self.client.create_subscription(500, self.sub_handler)
+            self._sub.subscribe_data_change(self._read_nodes)
+            self.status.emit("Status: Connected (subscribed)")
+            return True
+        except Exception as e:
+            self.stop_subscription()
+            self.status.emit(f"Status: Connected, polling (subscription failed - {str(e)})")
+            return False
+
+    def stop_subscription(self):
+        # Delete the subscription (errors ignored on a dead link).
+        sub, self._sub = self._sub, None
+        if sub:
+            try:
+                sub.delete()
+            except Exception:
+                pass
+
+    def close_session(self):
+        # Tear down subscription, registrations and session of the current client, if any.
+        if not self.client:
+            return
+        self.stop_subscription()
+        self.unregister_opc_nodes()
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+        self.client = None
+
+    @pyqtSlot()
+    def read_all(self):
+        # One Read request for all nodes.
+        if not self.client:
+            self.status.emit("Status: Not connected - can't read values")
+            return
+        try:
+            values = self.client.get_values(self._read_nodes)
+            self.values_read.emit(dict(zip(self.node_ids, values)))
+        except Exception as e:
+            self.status.emit(f"Error reading values: {str(e)}")
+
+    def post_writes(self, writes):
+        # Called from the GUI thread with {NodeId string: (value, VariantType, write number)}. A
+        # newer value replaces one still waiting, and a drain is queued only when the buffer was
+        # empty, so a slow PLC never builds a backlog of stale setpoints.
+        with self._write_lock:
+            idle = not self._pending_writes
+            self._pending_writes.update(writes)
+        if idle:
+            self.writes_pending.emit()
+
+    @pyqtSlot()
+    def write_values(self):
+        # Write everything buffered in one Write service call; each node's StatusCode is checked
+        # and only the writes the server rejected are reported as failed. writes_done then tells
+        # the panel which writes have finished, accepted or not.
+        with self._write_lock:
+            writes, self._pending_writes = self._pending_writes, {}
+        if not writes:
+            return
+        node_ids = list(writes)
+        accepted = dict.fromkeys(node_ids, False)
+        if not self.client:
+            for node_id in node_ids:
+                self.write_failed.emit(node_id, "Not connected - can't set value")
+        else:
+            try:
+                nodeids = [self._reg[node_id].nodeid for node_id in node_ids]
+                values = [ua.DataValue(ua.Variant(value, variant_type))
+                          for value, variant_type, _ in writes.values()]
+                # uaclient.set_attributes instead of client.set_values: the latter raises on the first
+                # bad result, which would hide which writes in the batch actually went through.
+                results = self.client.uaclient.set_attributes(nodeids, values, ua.AttributeIds.Value)
+            except Exception as e:
+                # The request itself failed: nothing in the batch was written.
+                for node_id in node_ids:
+                    self.write_failed.emit(node_id, str(e) or type(e).__name__)
+            else:
+                for node_id, result in zip(node_ids, results):
+                    if result.is_good():
+                        accepted[node_id] = True
+                    else:
+                        self.write_failed.emit(node_id, str(ua.UaStatusCodeError(result.value)))
+        self.writes_done.emit({node_id: (value, number, accepted[node_id])
+                               for node_id, (value, _, number) in writes.items()})
+
+    def abort(self):
+        # Called from the GUI thread when shutdown takes too long (hung PLC): drop the socket so
+        # every pending request fails at once instead of running into its timeout.
+        client = self.client
+        if client:
+            try:
+                client.disconnect_socket()
+            except Exception:
+                pass
+
+    @pyqtSlot()
+    def shutdown(self):
+        # Close the session and stop this worker's thread (the panel waits for it on exit).
+        if self._keepalive_timer:
+            self._keepalive_timer.stop()
+        if self._retry_timer:
+            self._retry_timer.stop()
+        # CloseSession (sent with DeleteSubscriptions) drops the subscription and the registered
+        # nodes on the server, so skip their separate requests and save two round-trips on exit.
+        self._sub = None
+        self._reg = {}
+        self._read_nodes = []
+        self.close_session()
+        self.thread().quit()
+
+
+class LogWriter(QObject):
+    # Writes log lines on its own QThread so a slow disk (network share, USB stick) never
+    # stalls the GUI. The panel opens the file (to report errors right away) and then only
+    # sends finished lines through a queued signal.
+    FLUSH_LINES = 30  # log lines buffered before an explicit flush (~30 s at 1 Hz)
+
+    error = pyqtSignal(str)
+
+    def __init__(self, log_file):
+        super().__init__()
+        self.log_file = log_file
+        self._lines_since_flush = 0
+
+    @pyqtSlot(str)
+    def write_line(self, line):
+        # Let the file buffer absorb the 1 Hz lines; push to disk every FLUSH_LINES.
+        try:
+            self.log_file.write(line)
+            self._lines_since_flush += 1
+            if self._lines_since_flush >= self.FLUSH_LINES:
+                self.log_file.flush()
+                self._lines_since_flush = 0
+        except Exception as e:
+            self.error.emit(f"Logging error: {str(e)}")
+
+    @pyqtSlot()
+    def close(self):
+        # Flush and close the file, then stop this writer's thread (queued after all pending lines).
+        try:
+            self.log_file.close()
+        except Exception:
+            pass
+        self.thread().quit()
+
+
 class OPCControlPanel(QMainWindow):
-    # Top-level window: builds grouped controls, manages OPC UA client, refresh/logging, and write-backs.
+    # Top-level window: builds grouped controls, drives the OPC worker, refresh/logging, and write-backs.
+    # Requests to the worker (queued across threads)
+    request_connect = pyqtSignal()
+    request_read = pyqtSignal()
+    request_shutdown = pyqtSignal()
+    # Requests to the log writer (queued across threads)
+    request_log_line = pyqtSignal(str)
+    request_log_close = pyqtSignal()
+
+    # Polling fallback: slow down after IDLE_POLLS reads without any change (not while logging).
+    REFRESH_MS = 1000
+    IDLE_REFRESH_MS = 3000
+    IDLE_POLLS = 5
+
+    CLOSE_TIMEOUT_MS = 500  # graceful OPC session close budget on exit
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("OPC UA Control Panel")
         self.setGeometry(100, 100, 800, 800)  # compact window
 
-        # --- OPC UA connection state ---
-        self.client = None
+        # --- OPC UA connection state (the client itself lives in the worker thread) ---
+        self.connected = False
+        self.subscribed = False
         self.url = "opc.tcp://DESKTOP-UH9J072:4980/Softing_dataFEED_OPC_Suite_Configuration2"
 
         # --- Derived parameter: Einzellinse - Extraction (kept when Extraction changes) ---
-        self.delta_voltage = 0.0
+        # Held in slider ticks; both sliders use the same multiplier (10 ticks per volt).
+        self.delta_ticks = 0
 
         # --- Common step sizes for analog sliders (user-selectable) ---
         self.allowed_steps = [0.01, 0.1, 1.0, 10.0, 100.0, 1000.0]
 
-        # --- Logging toggles/handle ---
+        # --- Logging toggle + writer thread (created per logging session) ---
         self.logging_active = False
-        self.log_file = None
-
-        # Build UI and connect once at startup.
+        self.log_writer = None
+        self.log_thread = None
+
+        # --- Last PLC values by NodeId string (batched reads + subscription pushes) ---
+        self._values = {}
+        self._idle_polls = 0  # consecutive polls that returned unchanged values
+
+        # --- Write queue: NodeId string -> (value, VariantType), flushed as one batched write ---
+        # Writes arriving within 50 ms (several checkboxes, Extraction + Einzellinse) share one
+        # Write request; a newer value for the same node replaces the queued one.
+        self._write_queue = {}
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(50)
+        self._write_timer.timeout.connect(self.flush_write_queue)
+        # Every batch handed to the worker gets a number; a node stays "in flight" until the
+        # worker reports its newest write finished, and reads do not override it meanwhile.
+        self._write_number = 0
+        self._writes_in_flight = {}  # NodeId string -> number of its newest unfinished write
+
+        # Build UI, start the OPC worker thread, and connect once at startup.
         self.init_ui()
+        self.start_worker()
         self.connect_opc()
 
-        # --- Auto-refresh timer (1 Hz) reads all indicators and updates displays ---
+        # --- 1 Hz timer: writes the log line; polls everything only if no subscription exists ---
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_all)
-        self.refresh_timer.start(1000)
+        self.refresh_timer.timeout.connect(self.on_refresh_tick)
+        self.refresh_timer.start(self.REFRESH_MS)
 
     def init_ui(self):
-        # Compose all groups: digital controls, oven, source, optics, status + action buttons.
+        # Compose the panel: digital controls, oven/source/optics tabs, status + action buttons.
+        QApplication.instance().setStyleSheet(PANEL_STYLESHEET)
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
 
@@ -87,19 +431,7 @@ class OPCControlPanel(QMainWindow):
 
         # === Digital (Boolean) Controls: two columns of toggles ===
         bool_group = QGroupBox("Digital Controls")
-        bool_group.setStyleSheet("""
-            QGroupBox { 
-                background-color: #f0f8ff;
-                border: 1px solid gray;
-                border-radius: 3px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
+        bool_group.setObjectName("boolGroup")  # styled by PANEL_STYLESHEET
         bool_layout = QHBoxLayout()
         bool_layout.setSpacing(15)
 
@@ -129,7 +461,7 @@ class OPCControlPanel(QMainWindow):
             label = QLabel(description)
             checkbox = QCheckBox()
             checkbox.node_id = node_id
-            checkbox.stateChanged.connect(self.on_checkbox_changed)
+            checkbox.stateChanged.connect(partial(self.on_checkbox_changed, node_id))
             hbox.addWidget(label)
             hbox.addWidget(checkbox)
             left_column.addLayout(hbox)
@@ -142,7 +474,7 @@ class OPCControlPanel(QMainWindow):
             label = QLabel(description)
             checkbox = QCheckBox()
             checkbox.node_id = node_id
-            checkbox.stateChanged.connect(self.on_checkbox_changed)
+            checkbox.stateChanged.connect(partial(self.on_checkbox_changed, node_id))
             hbox.addWidget(label)
             hbox.addWidget(checkbox)
             right_column.addLayout(hbox)
@@ -153,21 +485,152 @@ class OPCControlPanel(QMainWindow):
         bool_group.setLayout(bool_layout)
         main_layout.addWidget(bool_group)
 
-        # === Oven current control + temperature readback ===
+        # NodeId -> widget update; shared by refresh_all and subscription notifications.
+        # Only widgets that exist get a handler; values for unbuilt tabs just stay cached.
+        self.value_handlers = {}
+        for node_id, checkbox in self.checkboxes.items():
+            self.value_handlers[node_id] = lambda cb=checkbox: self.refresh_checkbox(cb)
+
+        # Page rows (built when their tab is first shown):
+        #   ("voltage", name, label, max V, output node, indicator node, log column, handler)
+        #   ("indicator", label, node, log column, unit, decimals)
+        #   "delta" = Einzellinse - Extraction display, None = separator line
+        self.temp_rows = [
+            ("indicator", "Current Temperature [°C]:",
+             "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ofen_Temp", "Oven Temp", "°C", 1),
+        ]
+        self.source_rows = [
+            ("voltage", "sputter", "Sputter Voltage", 10000,
+             "ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Sputter_U",
+             "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Sputter_U",
+             "Sputter V", self.on_voltage_changed),
+            None,
+            ("indicator", "Sputter Current Indicator [mA]:",
+             "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Sputter_I", "Sputter I", "mA", 3),
+            ("indicator", "Ionizer Current Indicator [A]:",
+             "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ionisierer", "Ionizer I", "A", 1),
+            None,
+            ("voltage", "extraction", "Extraction Voltage", 30000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Extraktion",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Extraktion",
+             "Extract V", self.on_extraction_voltage_changed),
+            "delta",
+            ("voltage", "einzellinse", "Einzellinse Voltage", 30000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Einzellinse",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Einzellinse",
+             "Einzellinse V", self.on_einzellinse_voltage_changed),
+        ]
+        self.optics_rows = [
+            ("voltage", "lens2", "Lens 2 Voltage", 12500,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Linse2",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Linse2",
+             "Lens2 V", self.on_voltage_changed),
+            None,
+            ("voltage", "ion_cooler", "Ion Cooler Voltage", 40000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Ionenkuehler",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Ionenkuehler",
+             "Ion Cooler V", self.on_voltage_changed),
+            None,
+            ("voltage", "quad1", "Quadrupole 1 Voltage", 6000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad1",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad1",
+             "Quad1 V", self.on_voltage_changed),
+            ("voltage", "quad2", "Quadrupole 2 Voltage", 6000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad2",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad2",
+             "Quad2 V", self.on_voltage_changed),
+            ("voltage", "quad3", "Quadrupole 3 Voltage", 6000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad3",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad3",
+             "Quad3 V", self.on_voltage_changed),
+            None,
+            ("voltage", "esa", "ESA Voltage", 3000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_ESA",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_ESA",
+             "ESA V", self.on_voltage_changed),
+            ("voltage", "esa_correction", "ESA Voltage Correction", 1000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_ESA_Z",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_ESA_Z",
+             "ESA Corr V", self.on_voltage_changed),
+            None,
+            ("voltage", "lens4", "Lens 4 Voltage", 10000,
+             "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Linse4",
+             "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Linse4",
+             "Lens4 V", self.on_voltage_changed),
+        ]
+
+        # Nodes the worker reads/subscribes and the log columns come from the tables, so
+        # they cover all tabs whether built or not (order defines the log columns).
+        self.oven_current_node = "ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Ofen"
+        self.output_nodes = [self.oven_current_node]
+        self.log_columns = []
+        for rows in (self.temp_rows, self.source_rows, self.optics_rows):
+            self.register_rows(rows)
+
+        # Widget registries, filled as tabs get built.
+        self.controls_by_name = {}
+        self.analog_controls = []
+
+        # === Oven / source / optics groups as tabs, each built on first show ===
+        self.tabs = QTabWidget()
+        self.tab_builders = {}
+        for title, builder in [("Oven", self.build_temp_group),
+                               ("Ion Source", self.build_source_group),
+                               ("Ion Optics", self.build_optics_group)]:
+            page = QWidget()
+            page.setLayout(QVBoxLayout())
+            self.tab_builders[self.tabs.addTab(page, title)] = builder
+        self.on_tab_changed(self.tabs.currentIndex())
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        main_layout.addWidget(self.tabs)
+
+        # === Global status banner ===
+        self.status_label = QLabel("Status: Not connected")
+        main_layout.addWidget(self.status_label)
+
+        # === Action buttons ===
+        btn_layout = QHBoxLayout()
+        btn_layout.setSpacing(5)
+        self.refresh_btn = QPushButton("Refresh Now"); self.refresh_btn.clicked.connect(self.refresh_all)
+        self.connect_btn = QPushButton("Reconnect"); self.connect_btn.clicked.connect(self.reconnect_opc)
+        self.log_btn = QPushButton("Start Logging"); self.log_btn.clicked.connect(self.toggle_logging); self.log_btn.setCheckable(True)
+        btn_layout.addWidget(self.refresh_btn)
+        btn_layout.addWidget(self.connect_btn)
+        btn_layout.addWidget(self.log_btn)
+        main_layout.addLayout(btn_layout)
+
+    def register_rows(self, rows):
+        # Collect output nodes and log columns of a page table (no widgets involved).
+        for row in rows:
+            if row is None or row == "delta":
+                continue
+            if row[0] == "voltage":
+                _, _, _, _, out_node, in_node, log_name, _ = row
+                self.output_nodes.append(out_node)
+                self.log_columns.append((log_name, in_node))
+            else:
+                _, _, node_id, log_name, _, _ = row
+                self.log_columns.append((log_name, node_id))
+
+    def on_tab_changed(self, index):
+        # Build a tab's widgets the first time it is shown, then bring the shown tab up to date
+        # from the value cache (widgets on hidden tabs skip their updates).
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder(self.tabs.widget(index).layout())
+        # Deferred: new child widgets are only shown once the event loop runs.
+        QTimer.singleShot(0, self.apply_cached_values)
+
+    def apply_cached_values(self):
+        # Run every widget handler against the value cache (hidden widgets return early).
+        for node_id, handler in list(self.value_handlers.items()):
+            if node_id in self._values:
+                handler()
+
+    def build_temp_group(self, page_layout):
+        # Oven current control + temperature readback.
         temp_group = QGroupBox("Oven Temperature Control")
-        temp_group.setStyleSheet("""
-            QGroupBox { 
-                background-color: #fff0f5;
-                border: 1px solid gray;
-                border-radius: 3px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
+        temp_group.setObjectName("tempGroup")  # styled by PANEL_STYLESHEET
         temp_layout = QFormLayout()
         temp_layout.setVerticalSpacing(2)
         temp_layout.setFieldGrowthPolicy(QFormLayout.AllNonFixedFieldsGrow)
@@ -176,214 +639,87 @@ class OPCControlPanel(QMainWindow):
         self.current_control = self.create_slider_control(
             0, 2, 100, "A", default_step=0.01, decimals=2
         )
-        self.current_control['node_id'] = "ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Ofen"
+        self.current_control['node_id'] = self.oven_current_node
         self.current_control['slider'].valueChanged.connect(self.on_current_changed)
         temp_layout.addRow("Oven Current [A]:", self.current_control['container'])
+        self.analog_controls.append(self.current_control)
+        self.value_handlers[self.oven_current_node] = lambda c=self.current_control: self.refresh_voltage(c)
 
         # Temperature readout (indicator only)
-        self.temp_display = QLabel("--")
-        self.temp_display.setAlignment(Qt.AlignLeft)
-        self.temp_display.node_id = "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ofen_Temp"
-        temp_layout.addRow("Current Temperature [°C]:", self.temp_display)
+        self.build_rows(temp_layout, self.temp_rows)
 
         temp_group.setLayout(temp_layout)
-        main_layout.addWidget(temp_group)
+        page_layout.addWidget(temp_group)
+        page_layout.addStretch()
 
-        # === Source voltages and currents ===
+    def build_source_group(self, page_layout):
+        # Source voltages and currents.
         source_group = QGroupBox("Ion Source Controls")
-        source_group.setStyleSheet("""
-            QGroupBox { 
-                background-color: #f0fff0;
-                border: 1px solid gray;
-                border-radius: 3px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
+        source_group.setObjectName("sourceGroup")  # styled by PANEL_STYLESHEET
         source_layout = QFormLayout()
         source_layout.setVerticalSpacing(1)
         source_layout.setFieldGrowthPolicy(QFormLayout.AllNonFixedFieldsGrow)
 
-        # Sputter voltage (control + indicator)
-        self.sputter_voltage_control = self.create_slider_control(0, 10000, 10, "V", default_step=10.0)
-        self.sputter_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Sputter_U"
-        self.sputter_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        source_layout.addRow("Sputter Voltage Control [V]:", self.sputter_voltage_control['container'])
-
-        self.sputter_voltage_display = QLabel("--")
-        self.sputter_voltage_display.node_id = "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Sputter_U"
-        source_layout.addRow("Sputter Voltage Indicator [V]:", self.sputter_voltage_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        source_layout.addRow(separator)
-
-        self.sputter_current_display = QLabel("--")
-        self.sputter_current_display.node_id = "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Sputter_I"
-        source_layout.addRow("Sputter Current Indicator [mA]:", self.sputter_current_display)
-
-        self.ionizer_current_display = QLabel("--")
-        self.ionizer_current_display.node_id = "ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ionisierer"
-        source_layout.addRow("Ionizer Current Indicator [A]:", self.ionizer_current_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        source_layout.addRow(separator)
-
-        # Extraction voltage (control + indicator)
-        self.extraction_voltage_control = self.create_slider_control(0, 30000, 10, "V", default_step=10.0)
-        self.extraction_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Extraktion"
-        self.extraction_voltage_control['slider'].valueChanged.connect(self.on_extraction_voltage_changed)
-        source_layout.addRow("Extraction Voltage Control [V]:", self.extraction_voltage_control['container'])
-
-        self.extraction_voltage_display = QLabel("--")
-        self.extraction_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Extraktion"
-        source_layout.addRow("Extraction Voltage Indicator [V]:", self.extraction_voltage_display)
-
-        # Delta = Einzellinse - Extraction (display only; kept up to date on changes)
-        self.delta_display = QLabel("--")
-        source_layout.addRow("Delta Voltage [V]:", self.delta_display)
-
-        # Einzellinse voltage (control + indicator)
-        self.einzellinse_voltage_control = self.create_slider_control(0, 30000, 10, "V", default_step=10.0)
-        self.einzellinse_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Einzellinse"
-        self.einzellinse_voltage_control['slider'].valueChanged.connect(self.on_einzellinse_voltage_changed)
-        source_layout.addRow("Einzellinse Voltage Control [V]:", self.einzellinse_voltage_control['container'])
-
-        self.einzellinse_voltage_display = QLabel("--")
-        self.einzellinse_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Einzellinse"
-        source_layout.addRow("Einzellinse Voltage Indicator [V]:", self.einzellinse_voltage_display)
+        self.build_rows(source_layout, self.source_rows)
+        for name in ("extraction", "einzellinse"):
+            # Delta follows either slider.
+            control = self.controls_by_name[name]
+            self.value_handlers[control['node_id']] = lambda c=control: self.refresh_source_voltage(c)
 
         source_group.setLayout(source_layout)
-        main_layout.addWidget(source_group)
+        page_layout.addWidget(source_group)
+        page_layout.addStretch()
 
-        # === Ion optics (multiple lenses/quadrupoles/ESA) ===
+    def build_optics_group(self, page_layout):
+        # Ion optics (multiple lenses/quadrupoles/ESA).
         optics_group = QGroupBox("Ion Optics Controls")
-        optics_group.setStyleSheet("""
-            QGroupBox { 
-                background-color: #f5f0ff;
-                border: 1px solid gray;
-                border-radius: 3px;
-                margin-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-        """)
+        optics_group.setObjectName("opticsGroup")  # styled by PANEL_STYLESHEET
         optics_layout = QFormLayout()
         optics_layout.setVerticalSpacing(1)
         optics_layout.setFieldGrowthPolicy(QFormLayout.AllNonFixedFieldsGrow)
 
-        # Lens 2
-        self.lens2_voltage_control = self.create_slider_control(0, 12500, 10, "V", default_step=10.0)
-        self.lens2_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Linse2"
-        self.lens2_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Lens 2 Voltage Control [V]:", self.lens2_voltage_control['container'])
-        self.lens2_voltage_display = QLabel("--")
-        self.lens2_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Linse2"
-        optics_layout.addRow("Lens 2 Voltage Indicator [V]:", self.lens2_voltage_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        optics_layout.addRow(separator)
-
-        # Ion Cooler
-        self.ion_cooler_voltage_control = self.create_slider_control(0, 40000, 10, "V", default_step=10.0)
-        self.ion_cooler_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Ionenkuehler"
-        self.ion_cooler_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Ion Cooler Voltage Control [V]:", self.ion_cooler_voltage_control['container'])
-        self.ion_cooler_voltage_display = QLabel("--")
-        self.ion_cooler_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Ionenkuehler"
-        optics_layout.addRow("Ion Cooler Voltage Indicator [V]:", self.ion_cooler_voltage_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        optics_layout.addRow(separator)
-
-        # Quadrupole 1
-        self.quad1_voltage_control = self.create_slider_control(0, 6000, 10, "V", default_step=10.0)
-        self.quad1_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad1"
-        self.quad1_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Quadrupole 1 Voltage Control [V]:", self.quad1_voltage_control['container'])
-        self.quad1_voltage_display = QLabel("--")
-        self.quad1_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad1"
-        optics_layout.addRow("Quadrupole 1 Voltage Indicator [V]:", self.quad1_voltage_display)
-
-        # Quadrupole 2
-        self.quad2_voltage_control = self.create_slider_control(0, 6000, 10, "V", default_step=10.0)
-        self.quad2_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad2"
-        self.quad2_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Quadrupole 2 Voltage Control [V]:", self.quad2_voltage_control['container'])
-        self.quad2_voltage_display = QLabel("--")
-        self.quad2_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad2"
-        optics_layout.addRow("Quadrupole 2 Voltage Indicator [V]:", self.quad2_voltage_display)
-
-        # Quadrupole 3
-        self.quad3_voltage_control = self.create_slider_control(0, 6000, 10, "V", default_step=10.0)
-        self.quad3_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Quad3"
-        self.quad3_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Quadrupole 3 Voltage Control [V]:", self.quad3_voltage_control['container'])
-        self.quad3_voltage_display = QLabel("--")
-        self.quad3_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Quad3"
-        optics_layout.addRow("Quadrupole 3 Voltage Indicator [V]:", self.quad3_voltage_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        optics_layout.addRow(separator)
-
-        # ESA + correction
-        self.esa_voltage_control = self.create_slider_control(0, 3000, 10, "V", default_step=10.0)
-        self.esa_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_ESA"
-        self.esa_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("ESA Voltage Control [V]:", self.esa_voltage_control['container'])
-        self.esa_voltage_display = QLabel("--")
-        self.esa_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_ESA"
-        optics_layout.addRow("ESA Voltage Indicator [V]:", self.esa_voltage_display)
-
-        self.esa_correction_control = self.create_slider_control(0, 1000, 10, "V", default_step=10.0)
-        self.esa_correction_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_ESA_Z"
-        self.esa_correction_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("ESA Voltage Correction Control [V]:", self.esa_correction_control['container'])
-        self.esa_correction_display = QLabel("--")
-        self.esa_correction_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_ESA_Z"
-        optics_layout.addRow("ESA Voltage Correction Indicator [V]:", self.esa_correction_display)
-
-        # Separator
-        separator = QFrame(); separator.setFrameShape(QFrame.HLine); separator.setFrameShadow(QFrame.Sunken); separator.setFixedHeight(1)
-        optics_layout.addRow(separator)
-
-        # Lens 4
-        self.lens4_voltage_control = self.create_slider_control(0, 10000, 10, "V", default_step=10.0)
-        self.lens4_voltage_control['node_id'] = "ns=3;s=OPC_1.PLC_GND1/Analog_Out/Out_Cal_Linse4"
-        self.lens4_voltage_control['slider'].valueChanged.connect(self.on_voltage_changed)
-        optics_layout.addRow("Lens 4 Voltage Control [V]:", self.lens4_voltage_control['container'])
-        self.lens4_voltage_display = QLabel("--")
-        self.lens4_voltage_display.node_id = "ns=3;s=OPC_1.PLC_GND1/Analog_In/In_Cal_Linse4"
-        optics_layout.addRow("Lens 4 Voltage Indicator [V]:", self.lens4_voltage_display)
+        self.build_rows(optics_layout, self.optics_rows)
 
         optics_group.setLayout(optics_layout)
-        main_layout.addWidget(optics_group)
-
-        # === Global status banner ===
-        self.status_label = QLabel("Status: Not connected")
-        main_layout.addWidget(self.status_label)
-
-        # === Action buttons ===
-        btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(5)
-        self.refresh_btn = QPushButton("Refresh Now"); self.refresh_btn.clicked.connect(self.refresh_all)
-        self.connect_btn = QPushButton("Reconnect"); self.connect_btn.clicked.connect(self.reconnect_opc)
-        self.log_btn = QPushButton("Start Logging"); self.log_btn.clicked.connect(self.toggle_logging); self.log_btn.setCheckable(True)
-        btn_layout.addWidget(self.refresh_btn)
-        btn_layout.addWidget(self.connect_btn)
-        btn_layout.addWidget(self.log_btn)
-        main_layout.addLayout(btn_layout)
+        page_layout.addWidget(optics_group)
+        page_layout.addStretch()
+
+    def add_indicator(self, layout, label, node_id, unit, decimals=1):
+        # Read-only PLC value label, registered for refresh.
+        display = QLabel("--")
+        display.node_id = node_id
+        display.last_value = None  # last value shown, to skip unchanged repaints
+        layout.addRow(label, display)
+        self.value_handlers[node_id] = lambda: self.refresh_voltage_display(display, unit, decimals)
+        return display
+
+    def make_separator(self):
+        # Thin horizontal rule between row groups (drawn by the QFrame#sep stylesheet rule).
+        separator = QFrame()
+        separator.setObjectName("sep")
+        return separator
+
+    def build_rows(self, layout, rows):
+        # Create the widgets of a page table (see init_ui for the row formats).
+        for row in rows:
+            if row is None:
+                layout.addRow(self.make_separator())
+            elif row == "delta":
+                self.delta_display = QLabel("--")
+                layout.addRow("Delta Voltage [V]:", self.delta_display)
+            elif row[0] == "voltage":
+                _, name, label, max_val, out_node, in_node, _, handler = row
+                control = self.create_slider_control(0, max_val, 10, "V", default_step=10.0)
+                control['node_id'] = out_node
+                control['slider'].valueChanged.connect(handler)
+                layout.addRow(f"{label} Control [V]:", control['container'])
+                control['display'] = self.add_indicator(layout, f"{label} Indicator [V]:", in_node, "V")
+                self.controls_by_name[name] = control
+                self.analog_controls.append(control)
+                self.value_handlers[out_node] = lambda c=control: self.refresh_voltage(c)
+            else:
+                _, label, node_id, _, unit, decimals = row
+                self.add_indicator(layout, label, node_id, unit, decimals)
 
     def create_slider_control(self, min_val, max_val, multiplier, unit, default_step=1.0, decimals=1):
         # Build a reusable analog control row:
@@ -420,36 +756,36 @@ class OPCControlPanel(QMainWindow):
         step_selector.setCurrentIndex(default_index)
 
         # Value display (bold, right-aligned)
-        value_label = QLabel(f"{min_val:.{decimals}f} {unit}")
+        # Label format is built once per control; update_value only fills in the number.
+        value_format = "{:." + str(decimals) + "f} " + unit
+        inv_multiplier = 1.0 / multiplier  # ticks -> real units with one multiply
+        value_label = QLabel(value_format.format(min_val))
         value_label.setStyleSheet("font-weight: bold;")
         value_label.setFixedWidth(90)
         value_label.setAlignment(Qt.AlignRight)
 
-        # Attach control metadata so ScrollableSlider can read step size and scaling.
-        slider.control = {
-            'step_selector': step_selector,
-            'multiplier': multiplier
-        }
-
         # Local helpers to keep the UI in sync and apply stepped changes.
+        last_ticks = [None]
+
         def update_value(value):
-            real_value = value / multiplier
-            value_label.setText(f"{real_value:.{decimals}f} {unit}")
+            if value == last_ticks[0]:
+                return
+            last_ticks[0] = value
+            value_label.setText(value_format.format(value * inv_multiplier))
 
-        def step_ticks():
-            val = step_selector.currentData()
-            if val is None:
-                val = float(step_selector.currentText().replace(",", "."))
-            return max(1, round(val * multiplier))
+        def update_step(index):
+            # Step size -> integer slider ticks (min 1), recomputed only when the selection changes.
+            control['step_ticks'] = max(1, round(step_selector.itemData(index) * multiplier))
 
         def decrease_value():
-            slider.setValue(max(slider.minimum(), slider.value() - step_ticks()))
+            slider.setValue(max(slider.minimum(), slider.value() - control['step_ticks']))
 
         def increase_value():
-            slider.setValue(min(slider.maximum(), slider.value() + step_ticks()))
+            slider.setValue(min(slider.maximum(), slider.value() + control['step_ticks']))
 
         # Wire events
         slider.valueChanged.connect(update_value)
+        step_selector.currentIndexChanged.connect(update_step)
         decrease_btn.clicked.connect(decrease_value)
         increase_btn.clicked.connect(increase_value)
 
@@ -460,27 +796,175 @@ class OPCControlPanel(QMainWindow):
         layout.addWidget(step_selector)
         layout.addWidget(value_label)
 
-        return {
+        # Debounce: slider ticks only record the newest value; the OPC write happens once the
+        # value has settled for 100 ms, so a drag sends one write instead of one per tick.
+        write_timer = QTimer(container)
+        write_timer.setSingleShot(True)
+        write_timer.setInterval(100)
+
+        control = {
             'container': container,
             'slider': slider,
             'decrease_btn': decrease_btn,
             'increase_btn': increase_btn,
             'step_selector': step_selector,
             'value_label': value_label,
-            'multiplier': multiplier
+            'update_label': update_value,
+            'multiplier': multiplier,
+            'inv_multiplier': inv_multiplier,
+            'step_ticks': 1,
+            'pending_value': None,
+            'write_timer': write_timer
         }
+        write_timer.timeout.connect(lambda: self.write_control(control))
+        update_step(default_index)
+
+        # Attach the control dict so ScrollableSlider can read step size and scaling, and
+        # slider handlers can find their control directly from the sender.
+        slider.control = control
+        return control
+
+    def schedule_write(self, control, value):
+        # Remember the latest slider ticks and (re)start the control's debounce timer.
+        control['pending_value'] = value
+        control['write_timer'].start()
+
+    def write_control(self, control):
+        # Debounce timer fired: send the settled value to the worker.
+        value = control['pending_value']
+        if value is None:
+            return
+        control['pending_value'] = None
+        if not self.connected:
+            self.status_label.setText("Status: Not connected - can't set value")
+            return
+        self.enqueue_write(control['node_id'], value * control['inv_multiplier'], VariantType.Float)
+
+    def enqueue_write(self, node_id, value, variant_type):
+        # Queue one write; the 50 ms write timer sends everything queued as one batch.
+        self._write_queue[node_id] = (value, variant_type)
+        if not self._write_timer.isActive():
+            self._write_timer.start()
+
+    def flush_write_queue(self):
+        # Hand all queued writes to the worker's latest-wins buffer (sent as one set_values() batch).
+        self._write_timer.stop()
+        if not self._write_queue:
+            return
+        self._write_number += 1
+        writes = {node_id: (value, variant_type, self._write_number)
+                  for node_id, (value, variant_type) in self._write_queue.items()}
+        self._writes_in_flight.update(dict.fromkeys(writes, self._write_number))
+        self.worker.post_writes(writes)
+        self._write_queue = {}
+        self.adapt_refresh_interval(True)  # the user is tuning: poll fast again
+
+    def flush_pending_writes(self):
+        # Send any debounced/queued value that has not been written yet (used on close).
+        for control in self.analog_controls:
+            if control['write_timer'].isActive():
+                control['write_timer'].stop()
+                self.write_control(control)
+        self.flush_write_queue()
+
+    def start_worker(self):
+        # Move the OPC worker to its own thread and wire requests/results as queued signals.
+        node_ids = [node_id for node_id, _ in self.controls]
+        node_ids += self.output_nodes
+        node_ids += [node_id for _, node_id in self.log_columns]
+
+        self.opc_thread = QThread(self)
+        self.worker = OpcWorker(self.url, node_ids)
+        self.worker.moveToThread(self.opc_thread)
+
+        self.request_connect.connect(self.worker.connect_opc)
+        self.request_read.connect(self.worker.read_all)
+        self.request_shutdown.connect(self.worker.shutdown)
+
+        self.worker.connection_changed.connect(self.on_connection_changed)
+        self.worker.values_read.connect(self.on_values_read)
+        self.worker.write_failed.connect(self.on_write_failed)
+        self.worker.writes_done.connect(self.on_writes_done)
+        self.worker.status.connect(self.status_label.setText)
+        self.worker.sub_handler.data_changed.connect(self.on_data_changed)
+
+        self.opc_thread.start()
 
     def connect_opc(self):
-        # (Re)connect to the OPC UA server, update banner, and do an immediate refresh.
+        # (Re)connect in the worker; on_connection_changed reports the outcome.
+        self.status_label.setText("Status: Connecting...")
+        self.request_connect.emit()
+
+    def on_connection_changed(self, connected, subscribed):
+        self.connected = connected
+        self.subscribed = subscribed
+        self.adapt_refresh_interval(True)
+
+    def on_values_read(self, values):
+        # Batched read result: cache and update every widget, then log one line if active.
+        self.adapt_refresh_interval(values != self._values)
+        self._values = values
         try:
-            if self.client:
-                self.client.disconnect()
-            self.client = Client(self.url)
-            self.client.connect()
-            self.status_label.setText("Status: Connected")
-            self.refresh_all()
+            for node_id in values:
+                handler = self.value_handlers.get(node_id)
+                if handler:
+                    handler()
+            if not self.subscribed and self.status_label.text() != "Status: Auto-refreshing":
+                self.status_label.setText("Status: Auto-refreshing")
+            if self.logging_active:
+                self.write_log_entry()
         except Exception as e:
-            self.status_label.setText(f"Status: Connection failed - {str(e)}")
+            self.status_label.setText(f"Error reading values: {str(e)}")
+
+    def adapt_refresh_interval(self, changed):
+        # Poll at REFRESH_MS while values move (or a log is written), at IDLE_REFRESH_MS once
+        # nothing changed for IDLE_POLLS reads; any change snaps straight back.
+        if changed or self.subscribed or self.logging_active:
+            self._idle_polls = 0
+        else:
+            self._idle_polls += 1
+        interval = self.IDLE_REFRESH_MS if self._idle_polls > self.IDLE_POLLS else self.REFRESH_MS
+        if self.refresh_timer.interval() != interval:
+            self.refresh_timer.setInterval(interval)
+
+    def on_write_failed(self, node_id, message):
+        # Report only; the checkbox is put back to the PLC state in on_writes_done.
+        self.status_label.setText(f"Error: {message}")
+
+    def on_writes_done(self, done):
+        # Worker finished a batch: a node is settled once its newest write has come back (an
+        # older batch finishing while a newer value is on its way changes nothing). An accepted
+        # value becomes the cached PLC value; then the checkbox is synced from the cache, which
+        # puts a rejected click back to what the PLC really holds.
+        for node_id, (value, number, accepted) in done.items():
+            if self._writes_in_flight.get(node_id) != number:
+                continue
+            del self._writes_in_flight[node_id]
+            if accepted:
+                self._values[node_id] = value
+            checkbox = self.checkboxes.get(node_id)
+            if checkbox is not None and node_id in self._values:
+                self.refresh_checkbox(checkbox)
+
+    def on_data_changed(self, node_id, value):
+        # Subscription push (already on the GUI thread): cache the value and update its widget only.
+        self._values[node_id] = value
+        handler = self.value_handlers.get(node_id)
+        if handler is None:
+            return  # widget lives in a tab that has not been built yet
+        try:
+            handler()
+        except Exception as e:
+            self.status_label.setText(f"Error updating values: {str(e)}")
+
+    def on_refresh_tick(self):
+        # 1 Hz: with a live subscription the widgets are already current, so only log;
+        # otherwise poll all values (which also logs).
+        if self.subscribed:
+            if self.logging_active:
+                self.write_log_entry()
+        else:
+            self.refresh_all()
 
     def reconnect_opc(self):
         # Manual reconnect trigger (calls connect_opc).
@@ -497,32 +981,15 @@ class OPCControlPanel(QMainWindow):
                 self.log_btn.setChecked(False)
                 return
             try:
-                # Open file and write header once
-                self.log_file = open(file_path, "w")
-                header = "Timestamp\t"
+                # Open file (64 KiB buffer, flushed by the writer every FLUSH_LINES lines)
+                log_file = open(file_path, "w", buffering=1 << 16)
+                self.start_log_writer(log_file)
+                header = ["Timestamp"]
                 # Digital controls
-                for node_id, description in self.controls:
-                    header += f"{description}\t"
+                header.extend(description for _, description in self.controls)
                 # Analog indicator names (order matches write_log_entry)
-                indicators = [
-                    ("Oven Temp", self.temp_display),
-                    ("Sputter V", self.sputter_voltage_display),
-                    ("Sputter I", self.sputter_current_display),
-                    ("Ionizer I", self.ionizer_current_display),
-                    ("Extract V", self.extraction_voltage_display),
-                    ("Einzellinse V", self.einzellinse_voltage_display),
-                    ("Lens2 V", self.lens2_voltage_display),
-                    ("Ion Cooler V", self.ion_cooler_voltage_display),
-                    ("Quad1 V", self.quad1_voltage_display),
-                    ("Quad2 V", self.quad2_voltage_display),
-                    ("Quad3 V", self.quad3_voltage_display),
-                    ("ESA V", self.esa_voltage_display),
-                    ("ESA Corr V", self.esa_correction_display),
-                    ("Lens4 V", self.lens4_voltage_display)
-                ]
-                for name, _ in indicators:
-                    header += f"{name}\t"
-                self.log_file.write(header.rstrip() + "\n")
+                header.extend(name for name, _ in self.log_columns)
+                self.request_log_line.emit("\t".join(header) + "\n")
                 self.logging_active = True
                 self.log_btn.setText("Stop Logging")
                 self.status_label.setText(f"Status: Logging to {file_path}")
@@ -531,267 +998,197 @@ class OPCControlPanel(QMainWindow):
                 self.status_label.setText(f"Error opening log file: {str(e)}")
         else:
             # Stop logging and close file.
-            if self.log_file:
-                try:
-                    self.log_file.close()
-                except:
-                    pass
-                self.log_file = None
             self.logging_active = False
+            self.stop_log_writer()
             self.log_btn.setText("Start Logging")
             self.status_label.setText("Status: Logging stopped")
 
+    def start_log_writer(self, log_file):
+        # Hand the open file to a LogWriter on its own thread; lines go through request_log_line.
+        self.log_thread = QThread(self)
+        self.log_writer = LogWriter(log_file)
+        self.log_writer.moveToThread(self.log_thread)
+        self.request_log_line.connect(self.log_writer.write_line)
+        self.request_log_close.connect(self.log_writer.close)
+        self.log_writer.error.connect(self.status_label.setText)
+        self.log_thread.start()
+
+    def stop_log_writer(self):
+        # Close the file after the queued lines are written and wait for the writer thread to end.
+        if not self.log_writer:
+            return
+        self.request_log_close.emit()
+        self.request_log_line.disconnect(self.log_writer.write_line)
+        self.request_log_close.disconnect(self.log_writer.close)
+        self.log_thread.wait()
+        self.log_writer = None
+        self.log_thread = None
+
     def write_log_entry(self):
         # Append one TSV line with timestamp + all digital states + all analog indicators.
-        if not self.logging_active or not self.client or not self.log_file:
+        # Uses the cached PLC values, so logging costs no extra OPC round-trips.
+        if not self.logging_active or not self.connected:
             return
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_line = f"{timestamp}\t"
+            parts = [time.strftime("%Y-%m-%d %H:%M:%S")]
 
             # Digital values (checkboxes mirror them)
-            for node_id, _ in self.controls:
-                node = self.client.get_node(node_id)
-                value = node.get_value()
-                log_line += f"{value}\t"
+            parts.extend(str(self._values[node_id]) for node_id, _ in self.controls)
 
             # Analog values (same order as header)
-            indicators = [
-                self.temp_display, self.sputter_voltage_display,
-                self.sputter_current_display, self.ionizer_current_display,
-                self.extraction_voltage_display, self.einzellinse_voltage_display,
-                self.lens2_voltage_display, self.ion_cooler_voltage_display,
-                self.quad1_voltage_display, self.quad2_voltage_display,
-                self.quad3_voltage_display, self.esa_voltage_display,
-                self.esa_correction_display, self.lens4_voltage_display
-            ]
-            for indicator in indicators:
-                node = self.client.get_node(indicator.node_id)
-                value = node.get_value()
-                log_line += f"{value:.3f}\t"
-
-            self.log_file.write(log_line.rstrip() + "\n")
-            self.log_file.flush()
+            parts.extend(f"{self._values[node_id]:.3f}" for _, node_id in self.log_columns)
+
+            # File I/O happens in the LogWriter thread.
+            self.request_log_line.emit("\t".join(parts) + "\n")
         except Exception as e:
             self.status_label.setText(f"Logging error: {str(e)}")
 
-    def on_checkbox_changed(self, state):
-        # Write a boolean digital output when a checkbox is toggled.
-        checkbox = self.sender()
-        if not self.client:
+    def on_checkbox_changed(self, node_id, state):
+        # Write a boolean digital output when a checkbox is toggled (node_id bound at connect time).
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't set value")
             return
-        try:
-            node = self.client.get_node(checkbox.node_id)
-            new_value = state == Qt.Checked
-            node.set_value(new_value)
-        except Exception as e:
-            self.status_label.setText(f"Error: {str(e)}")
-            # revert UI to previous state
-            checkbox.blockSignals(True)
-            checkbox.setChecked(not new_value)
-            checkbox.blockSignals(False)
+        new_value = state == Qt.Checked
+        self.enqueue_write(node_id, new_value, VariantType.Boolean)
 
     def on_current_changed(self, value):
         # Write oven current (float) from slider ticks.
-        if not self.client:
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't set value")
             return
-        try:
-            node = self.client.get_node(self.current_control['node_id'])
-            real_value = float(value) / float(self.current_control['multiplier'])
-            node.set_value(real_value, VariantType.Float)
-        except Exception as e:
-            self.status_label.setText(f"Error setting current: {str(e)}")
+        self.schedule_write(self.current_control, value)
 
     def on_voltage_changed(self, value):
-        # Generic handler for many voltage sliders (find which control fired, then write).
-        slider = self.sender()
-        control = None
-        for c in [self.sputter_voltage_control, self.lens2_voltage_control, 
-                  self.ion_cooler_voltage_control, self.quad1_voltage_control,
-                  self.quad2_voltage_control, self.quad3_voltage_control,
-                  self.esa_voltage_control, self.esa_correction_control,
-                  self.lens4_voltage_control]:
-            if c['slider'] == slider:
-                control = c
-                break
-
-        if not control or not self.client:
+        # Generic handler for many voltage sliders (the sending slider carries its control dict).
+        control = self.sender().control
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't set value")
             return
-        try:
-            node = self.client.get_node(control['node_id'])
-            real_value = float(value) / float(control['multiplier'])
-            node.set_value(real_value, VariantType.Float)
-        except Exception as e:
-            self.status_label.setText(f"Error setting voltage: {str(e)}")
+        self.schedule_write(control, value)
 
     def on_extraction_voltage_changed(self, value):
-        # Write extraction voltage, then recompute Einzellinse so (Einzellinse - Extraction) = delta_voltage.
-        if not self.client:
+        # Write extraction voltage, then recompute Einzellinse so (Einzellinse - Extraction) = delta.
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't set value")
             return
-        try:
-            node = self.client.get_node(self.extraction_voltage_control['node_id'])
-            real_value = float(value) / float(self.extraction_voltage_control['multiplier'])
-            node.set_value(real_value, VariantType.Float)
+        self.schedule_write(self.controls_by_name["extraction"], value)
 
-            # Keep Einzellinse in sync with new extraction voltage.
-            self.update_einzellinse_voltage()
-        except Exception as e:
-            self.status_label.setText(f"Error setting extraction voltage: {str(e)}")
+        # Keep Einzellinse in sync with new extraction voltage.
+        self.update_einzellinse_voltage()
 
     def on_einzellinse_voltage_changed(self, value):
         # Write Einzellinse voltage and update delta display.
-        if not self.client:
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't set value")
             return
-        try:
-            node = self.client.get_node(self.einzellinse_voltage_control['node_id'])
-            real_value = float(value) / float(self.einzellinse_voltage_control['multiplier'])
-            node.set_value(real_value, VariantType.Float)
-
-            # Recompute delta = Einzellinse - Extraction for display.
-            extraction_value = self.extraction_voltage_control['slider'].value()
-            extraction_voltage = extraction_value / self.extraction_voltage_control['multiplier']
-            self.delta_voltage = real_value - extraction_voltage
-            self.delta_display.setText(f"{self.delta_voltage:.1f} V")
-        except Exception as e:
-            self.status_label.setText(f"Error setting Einzellinse voltage: {str(e)}")
+        self.schedule_write(self.controls_by_name["einzellinse"], value)
+
+        # Recompute delta = Einzellinse - Extraction for display.
+        self.delta_ticks = value - self.controls_by_name["extraction"]['slider'].value()
+        self.show_delta()
 
     def update_einzellinse_voltage(self):
-        # Apply current delta_voltage to the new extraction voltage (keeps spacing constant).
-        if not self.client:
+        # Apply current delta to the new extraction voltage (keeps spacing constant).
+        if not self.connected:
             return
         try:
             # Calculate desired Einzellinse = Extraction + delta
-            extraction_value = self.extraction_voltage_control['slider'].value()
-            extraction_voltage = extraction_value / self.extraction_voltage_control['multiplier']
-            new_einzellinse_voltage = extraction_voltage + self.delta_voltage
+            einzellinse = self.controls_by_name["einzellinse"]
+            slider = einzellinse['slider']
+            slider_value = self.controls_by_name["extraction"]['slider'].value() + self.delta_ticks
+            slider_value = min(max(slider_value, slider.minimum()), slider.maximum())
+            if slider_value == slider.value():
+                return  # same tick -> PLC already has this value, skip the write
 
             # Update slider without recursive signal
-            self.einzellinse_voltage_control['slider'].blockSignals(True)
-            slider_value = round(new_einzellinse_voltage * self.einzellinse_voltage_control['multiplier'])
-            self.einzellinse_voltage_control['slider'].setValue(slider_value)
-            self.einzellinse_voltage_control['slider'].blockSignals(False)
+            slider.blockSignals(True)
+            slider.setValue(slider_value)
+            slider.blockSignals(False)
+            einzellinse['update_label'](slider.value())
 
-            # Write to OPC
-            node = self.client.get_node(self.einzellinse_voltage_control['node_id'])
-            node.set_value(new_einzellinse_voltage, VariantType.Float)
+            # Write to OPC (debounced like a slider move)
+            self.schedule_write(einzellinse, slider.value())
 
             # Refresh delta display
-            self.delta_display.setText(f"{self.delta_voltage:.1f} V")
+            self.show_delta()
         except Exception as e:
             self.status_label.setText(f"Error updating Einzellinse voltage: {str(e)}")
 
     def refresh_all(self):
-        # Read all values and update UI (1 Hz). Also append a log line if logging is active.
-        if not self.client:
+        # Request one batched read of all values; on_values_read updates every widget (and logs).
+        # Runs on "Refresh Now" and at 1 Hz when no subscription is active.
+        if not self.connected:
             self.status_label.setText("Status: Not connected - can't read values")
             return
-        try:
-            # Booleans: sync checkboxes with PLC values (without emitting writes).
-            for node_id, checkbox in self.checkboxes.items():
-                node = self.client.get_node(node_id)
-                value = node.get_value()
-                checkbox.blockSignals(True)
-                checkbox.setChecked(value)
-                checkbox.blockSignals(False)
-
-            # Oven current slider follows PLC unless user is dragging.
-            current_node = self.client.get_node(self.current_control['node_id'])
-            current_value = current_node.get_value()
-            s = self.current_control['slider']
-            if not s.isSliderDown():
-                s.blockSignals(True)
-                s.setValue(round(current_value * self.current_control['multiplier']))
-                s.blockSignals(False)
-
-            # Temperature indicator
-            temp_node = self.client.get_node(self.temp_display.node_id)
-            temp_value = temp_node.get_value()
-            self.temp_display.setText(f"{temp_value:.1f} °C")
-
-            # Source controls/indicators
-            self.refresh_voltage(self.sputter_voltage_control)
-            self.refresh_voltage_display("sputter_voltage_display", "V")
-            self.refresh_voltage_display("sputter_current_display", "mA", 3)
-            self.refresh_voltage_display("ionizer_current_display", "A")
-
-            self.refresh_voltage(self.extraction_voltage_control)
-            self.refresh_voltage_display("extraction_voltage_display", "V")
-
-            self.refresh_voltage(self.einzellinse_voltage_control)
-            self.refresh_voltage_display("einzellinse_voltage_display", "V")
-
-            # Delta update from current sliders
-            extraction_value = self.extraction_voltage_control['slider'].value()
-            extraction_voltage = extraction_value / self.extraction_voltage_control['multiplier']
-            einzellinse_value = self.einzellinse_voltage_control['slider'].value()
-            einzellinse_voltage = einzellinse_value / self.einzellinse_voltage_control['multiplier']
-            self.delta_voltage = einzellinse_voltage - extraction_voltage
-            self.delta_display.setText(f"{self.delta_voltage:.1f} V")
-
-            # Ion optics controls/indicators
-            self.refresh_voltage(self.lens2_voltage_control)
-            self.refresh_voltage_display("lens2_voltage_display", "V")
-
-            self.refresh_voltage(self.ion_cooler_voltage_control)
-            self.refresh_voltage_display("ion_cooler_voltage_display", "V")
-
-            self.refresh_voltage(self.quad1_voltage_control)
-            self.refresh_voltage_display("quad1_voltage_display", "V")
-
-            self.refresh_voltage(self.quad2_voltage_control)
-            self.refresh_voltage_display("quad2_voltage_display", "V")
-
-            self.refresh_voltage(self.quad3_voltage_control)
-            self.refresh_voltage_display("quad3_voltage_display", "V")
-
-            self.refresh_voltage(self.esa_voltage_control)
-            self.refresh_voltage_display("esa_voltage_display", "V")
-
-            self.refresh_voltage(self.esa_correction_control)
-            self.refresh_voltage_display("esa_correction_display", "V")
-
-            self.refresh_voltage(self.lens4_voltage_control)
-            self.refresh_voltage_display("lens4_voltage_display", "V")
-
-            self.status_label.setText("Status: Auto-refreshing")
-
-            # Write one logging line if active
-            if self.logging_active:
-                self.write_log_entry()
+        self.request_read.emit()
 
-        except Exception as e:
-            self.status_label.setText(f"Error reading values: {str(e)}")
+    def refresh_checkbox(self, checkbox):
+        # Sync a checkbox with the PLC value (without emitting a write); no-op if unchanged, and
+        # skipped while the user's own write for it is still queued or in flight.
+        node_id = checkbox.node_id
+        if node_id in self._write_queue or node_id in self._writes_in_flight:
+            return
+        checked = bool(self._values[node_id])
+        if checkbox.isChecked() == checked:
+            return
+        checkbox.blockSignals(True)
+        checkbox.setChecked(checked)
+        checkbox.blockSignals(False)
+
+    def refresh_source_voltage(self, control):
+        # Extraction/Einzellinse slider sync plus the derived delta display.
+        if not control['slider'].isVisible():
+            return  # hidden tab; refreshed by on_tab_changed when shown
+        self.refresh_voltage(control)
+        self.refresh_delta()
+
+    def refresh_delta(self):
+        # Delta = Einzellinse - Extraction from the current slider positions.
+        self.delta_ticks = (self.controls_by_name["einzellinse"]['slider'].value()
+                            - self.controls_by_name["extraction"]['slider'].value())
+        self.show_delta()
+
+    def show_delta(self):
+        # Format the tick delta for display only (skipped when the text would not change).
+        delta_text = f"{self.delta_ticks * self.controls_by_name['einzellinse']['inv_multiplier']:.1f} V"
+        if self.delta_display.text() != delta_text:
+            self.delta_display.setText(delta_text)
 
     def refresh_voltage(self, control):
-        # Sync one analog control slider with PLC (unless user is dragging).
-        node = self.client.get_node(control['node_id'])
-        value = node.get_value()
+        # Sync one analog control slider with the last PLC read (unless user is dragging
+        # or a debounced write of a newer value is still pending).
+        value = self._values[control['node_id']]
         slider = control['slider']
-        if slider.isSliderDown():
+        if not slider.isVisible() or slider.isSliderDown() or control['write_timer'].isActive():
+            return
+        ticks = round(value * control['multiplier'])
+        if slider.value() != ticks:
+            slider.blockSignals(True)
+            slider.setValue(ticks)
+            slider.blockSignals(False)
+        control['update_label'](slider.value())  # signals were blocked, so sync the label here
+
+    def refresh_voltage_display(self, display, unit, decimals=1):
+        # Update a single indicator label from the last PLC read (display only).
+        if not display.isVisible():
+            return  # hidden tab; refreshed by on_tab_changed when shown
+        value = self._values[display.node_id]
+        if value == display.last_value:
             return
-        slider.blockSignals(True)
-        slider.setValue(round(value * control['multiplier']))
-        slider.blockSignals(False)
-
-    def refresh_voltage_display(self, display_name, unit, decimals=1):
-        # Update a single indicator label from its node (display only).
-        display = getattr(self, display_name)
-        node = self.client.get_node(display.node_id)
-        value = node.get_value()
+        display.last_value = value
         display.setText(f"{value:.{decimals}f} {unit}")
 
     def closeEvent(self, event):
-        # Clean shutdown: disconnect OPC, close log file, stop timer.
-        if self.client:
-            self.client.disconnect()
-        if self.log_file:
-            self.log_file.close()
+        # Clean shutdown: stop timer, send pending writes, close the OPC session in the worker
+        # while the log file is closed here, then give the worker CLOSE_TIMEOUT_MS before
+        # cutting its socket so a dead PLC cannot hang the exit.
         self.refresh_timer.stop()
+        self.flush_pending_writes()
+        self.request_shutdown.emit()
+        self.stop_log_writer()
+        if not self.opc_thread.wait(self.CLOSE_TIMEOUT_MS):
+            self.worker.abort()
+            self.opc_thread.wait()
         event.accept()
 
 
@@ -4,20 +4,265 @@
 # - Failsafe: persist last applied current to a file; optionally restore on startup
 # - Status indicator (gray/yellow/green/red) reflects idle/ramping/ok/stopped states
 # - 1) Operator selects target and ramp rate; 2) timed ramp adjusts setpoint in steps
-# - All OPC UA reads/writes happen through fixed nodes; UI shows current/target
+# - All OPC UA reads/writes happen through fixed nodes on a worker QThread, so a slow PLC
+#   never freezes the GUI; UI shows current/target
 
 import sys
 import os
+import math
+import threading
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QLabel, QPushButton, QDoubleSpinBox, QGroupBox, 
                             QFormLayout, QMessageBox, QFileDialog)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QObject, QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor, QPalette
 from opcua import Client, ua
 
 
+class IonizerWorker(QObject):
+    # Owns the OPC UA client and does all network I/O (connect, read actual current, write
+    # setpoint) on its own QThread. The window only talks to it through queued signals (plus
+    # the thread-safe post_current), and results come back as signals handled on the GUI thread.
+    connection_changed = pyqtSignal(bool, bool, str)  # connected, subscribed, error text
+    current_read = pyqtSignal(object)                 # actual current (A) from a read or push, None on error
+    write_done = pyqtSignal(float, str, object)       # setpoint (A), error text ("" on success), report tag
+    status = pyqtSignal(str)
+    write_pending = pyqtSignal()                      # internal: drain the setpoint mailbox in this thread
+
+    SUB_PERIOD_MS = 200         # publishing interval of the actual-current subscription
+    CURRENT_DEADBAND_A = 0.001  # absolute deadband: changes below the 1 mA display resolution are not pushed
+    KEEPALIVE_MS = 5000
+    REQUEST_TIMEOUT_S = 2       # per-request timeout, so a dead or unreachable PLC fails fast
+    SESSION_TIMEOUT_MS = 30000  # the server drops our session this long after we vanish
+    RETRY_MS = 1000             # first reconnect delay, doubled after every failed attempt
+    MAX_RETRY_MS = 30000
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self.client = None
+        self.current_in_node = None
+        self.current_out_node = None
+        self.applied_current = None  # last setpoint the PLC accepted (read by the window on exit)
+        self._keepalive_timer = None  # created on first connect (must live in the worker thread)
+        self._retry_timer = None
+        self._retry_ms = self.RETRY_MS
+
+        # Latest-wins setpoint mailbox shared with the GUI thread: (value, report tag), or None
+        # when nothing is pending.
+        self._pending_write = None
+        self._write_lock = threading.Lock()
+        self.write_pending.connect(self.write_current)
+
+    @pyqtSlot()
+    def connect_opc(self):
+        # (Re)establish the OPC UA session (single endpoint), rebuild node handles, subscribe.
+        if self._retry_timer:
+            self._retry_timer.stop()  # a manual reconnect replaces a pending retry
+        try:
+            self.close_session()
+            self.client = Client(self.url, timeout=self.REQUEST_TIMEOUT_S)
+            self.client.session_timeout = self.SESSION_TIMEOUT_MS
+            # Node handles are built once here and reused by read_current/write_current on every tick.
+            self.current_in_node = self.client.get_node("ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ionisierer")
+            self.current_out_node = self.client.get_node("ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Ionisierer")
+            self.client.connect()
+            subscribed = self.start_subscription()
+            self.connection_changed.emit(True, subscribed, "")
+            self.start_keepalive()
+            self._retry_ms = self.RETRY_MS
+        except Exception as e:
+            self.close_session()
+            self.connection_changed.emit(False, False, f"Connection failed - {str(e) or type(e).__name__}, "
+                                                       f"retrying in {self._retry_ms // 1000} s")
+            self.schedule_reconnect()
+
+    def schedule_reconnect(self):
+        # Retry a failed connect from a single-shot timer with exponential backoff
+        # (RETRY_MS doubling up to MAX_RETRY_MS), so an absent PLC is not hammered.
+        if self._retry_timer is None:
+            self._retry_timer = QTimer(self)
+            self._retry_timer.setSingleShot(True)
+            self._retry_timer.timeout.connect(self.connect_opc)
+        self._retry_timer.start(self._retry_ms)
+        self._retry_ms = min(self._retry_ms * 2, self.MAX_RETRY_MS)
+
+    def start_keepalive(self):
+        # Every KEEPALIVE_MS read the server time so a dead link is noticed even while no ramp
+        # is writing.
+        if self._keepalive_timer is None:
+            self._keepalive_timer = QTimer(self)
+            self._keepalive_timer.timeout.connect(self.keepalive)
+            self._keepalive_timer.start(self.KEEPALIVE_MS)
+
+    @pyqtSlot()
+    def keepalive(self):
+        if not self.client:
+            return  # reconnect is pending on the retry timer
+        try:
+            self.client.get_node(ua.ObjectIds.Server_ServerStatus_CurrentTime).get_value()
+        except Exception as e:
+            self.close_session()
+            self.connection_changed.emit(False, False, f"Connection lost - {str(e) or type(e).__name__}, reconnecting")
+            self.connect_opc()
+
+    def close_session(self):
+        # Disconnect the current client, if any (CloseSession also drops the subscription).
+        if not self.client:
+            return
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+        self.client = None
+
+    def start_subscription(self):
+        # Let the server push the actual current on change (absolute deadband) instead of a Read
+        # per display refresh. If the server refuses, the window keeps requesting reads.
+        try:
+            sub = self.client.create_subscription(self.SUB_PERIOD_MS, self)
+            try:
+                sub.deadband_monitor(self.current_in_node, self.CURRENT_DEADBAND_A, queuesize=1)
+            except Exception:
+                sub.subscribe_data_change(self.current_in_node, queuesize=1)  # deadband filter not supported
+            return True
+        except Exception as e:
+            self.status.emit(f"Subscription failed, reading on demand: {str(e)}")
+            return False
+
+    def datachange_notification(self, node, val, data):
+        # Subscription push from python-opcua's thread; the signal is queued onto the GUI thread.
+        self.current_read.emit(float(val) if val is not None else None)
+
+    @pyqtSlot()
+    def read_current(self):
+        # Read actual ionizer current (A) from OPC UA (analog input).
+        if not self.client:
+            self.status.emit("Read error: Not connected")
+            self.current_read.emit(None)
+            return
+        try:
+            value = self.current_in_node.get_value()
+            self.current_read.emit(float(value) if value is not None else None)
+        except Exception as e:
+            self.status.emit(f"Read error: {str(e)}")
+            self.current_read.emit(None)
+
+    def post_current(self, value, report=None):
+        # Called from the GUI thread. A newer setpoint replaces one still waiting, and a drain is
+        # queued only when the mailbox was empty, so a slow PLC never builds a backlog of stale
+        # ramp steps (an emergency stop overtakes them). Returns the (value, report) it replaced,
+        # which will never be written, or None.
+        with self._write_lock:
+            replaced = self._pending_write
+            self._pending_write = (value, report)
+        if replaced is None:
+            self.write_pending.emit()
+        return replaced
+
+    @pyqtSlot()
+    def write_current(self):
+        # Write the newest setpoint (A) to OPC UA (analog output) and report the outcome.
+        with self._write_lock:
+            pending, self._pending_write = self._pending_write, None
+        if pending is None:
+            return
+        value, report = pending
+        if not self.client:
+            self.write_done.emit(value, "Not connected", report)
+            return
+        try:
+            variant = ua.Variant(value, ua.VariantType.Float)
+            self.current_out_node.set_value(variant)
+            self.applied_current = value
+            self.write_done.emit(value, "", report)
+        except Exception as e:
+            self.write_done.emit(value, str(e) or type(e).__name__, report)
+
+    def abort(self):
+        # Called from the GUI thread when shutdown takes too long (hung PLC): drop the socket so
+        # the pending request fails at once instead of running into its timeout.
+        client = self.client
+        if client:
+            try:
+                client.disconnect_socket()
+            except Exception:
+                pass
+
+    @pyqtSlot()
+    def shutdown(self):
+        # Disconnect and stop this worker's thread (the window waits for it on exit).
+        if self._keepalive_timer:
+            self._keepalive_timer.stop()
+        if self._retry_timer:
+            self._retry_timer.stop()
+        self.close_session()
+        self.thread().quit()
+
+
+class FailsafeWriter(QObject):
+    # Saves the last applied current on its own QThread so a slow disk never stalls the GUI or
+    # the ramp. Only the newest value matters: post() replaces one still waiting, and the file
+    # is replaced atomically (temp file synced to disk, then os.replace) so neither a crash nor
+    # a power cut leaves it half written or empty.
+    error = pyqtSignal(str)
+    saved = pyqtSignal(str, str)  # path, text now on disk
+    save_pending = pyqtSignal()   # internal: write the mailbox in this thread
+
+    def __init__(self):
+        super().__init__()
+        self._pending = None  # (path, value) still to be written, shared with the GUI thread
+        self._lock = threading.Lock()
+        self.save_pending.connect(self.save)
+
+    def post(self, path, value):
+        # Called from the GUI thread; a save is queued only when the mailbox was empty.
+        with self._lock:
+            idle = self._pending is None
+            self._pending = (path, value)
+        if idle:
+            self.save_pending.emit()
+
+    @pyqtSlot()
+    def save(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        path, value = pending
+        text = f"{value:.3f}"
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.error.emit(f"Autosave failed: {str(e) or type(e).__name__}")
+            return
+        self.saved.emit(path, text)
+
+    @pyqtSlot()
+    def close(self):
+        # Stop this writer's thread (queued after any pending save).
+        self.thread().quit()
+
+
 class IonizerCurrentControl(QMainWindow):
-    # Main window: builds UI, manages OPC UA session, handles ramping and failsafe I/O.
+    # Main window: builds UI, drives the OPC worker, handles ramping and failsafe I/O.
+    request_connect = pyqtSignal()
+    request_read = pyqtSignal()
+    request_shutdown = pyqtSignal()
+    request_failsafe_close = pyqtSignal()
+
+    CLOSE_TIMEOUT_MS = 500    # graceful OPC session close budget on exit
+    RAMP_TICK_MS = 200        # ramp timer period; the setpoint is computed from elapsed time
+    RAMP_DECIMALS = 3         # setpoint resolution written during a ramp (1 mA, as in the failsafe file)
+    WRITE_DEADBAND_A = 0.005  # a ramp writes once its setpoint moved this far (the target is always written)
+    FAILSAFE_SAVE_MS = 1000   # ramp steps are saved to the failsafe file at most this often
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Ionizer Current Control - Safety Critical")
@@ -31,11 +276,24 @@ class IonizerCurrentControl(QMainWindow):
         self.current_value = 0.0      # last applied setpoint (A)
         self.target_current = 0.0     # operator target (A)
         self.ramp_active = False
+        self.ramp_pending = False     # start_ramp waits for a fresh readback
+        self.subscribed = False       # actual current is pushed by the worker's subscription
+        self.connected = None         # None until the first connect attempt has finished
+        self.actual_current = None    # last readback from the worker (A)
+        self.indicator_palettes = {}  # lamp colour -> QPalette, built on first use
+        self.shown_current = None     # (actual, target) currently painted in the labels
         self.failsafe_file = os.path.join(os.path.expanduser("~"), "ionizer_current_failsafe.txt")
         
-        # Build UI, connect OPC, load failsafe (with confirmation), then render labels.
+        # Build UI and start connecting OPC; the failsafe prompt (modal) and the first
+        # readback wait for the event loop, so the window is painted before the dialog.
         self.init_ui()
+        self.start_worker()
+        self.start_failsafe_writer()
         self.init_opc()
+        QTimer.singleShot(0, self.restore_failsafe)
+
+    def restore_failsafe(self):
+        # Load failsafe (with confirmation), then render labels.
         self.load_failsafe_with_confirmation()
         self.update_display()
 
@@ -70,6 +328,7 @@ class IonizerCurrentControl(QMainWindow):
         self.target_label = QLabel("--")   # operator target (A)
         self.status_indicator = QLabel()   # gray/yellow/green/red lamp
         self.status_indicator.setFixedSize(20, 20)
+        self.status_indicator.setAutoFillBackground(True)
         self.set_indicator_color(self.status_indicator, Qt.gray)
         
         display_layout.addRow("Actual Current [A]:", self.current_label)
@@ -113,22 +372,64 @@ class IonizerCurrentControl(QMainWindow):
         layout.addWidget(self.status_label)
 
     def set_indicator_color(self, label, color):
-        # Small colored square to reflect state (idle/ramping/ok/stopped).
-        palette = label.palette()
-        palette.setColor(QPalette.Window, color)
-        label.setAutoFillBackground(True)
+        # Small colored square to reflect state (idle/ramping/ok/stopped); one palette per
+        # colour is built once and reused.
+        palette = self.indicator_palettes.get(color)
+        if palette is None:
+            palette = QPalette(label.palette())
+            palette.setColor(QPalette.Window, color)
+            self.indicator_palettes[color] = palette
         label.setPalette(palette)
-        label.update()
+
+    def start_worker(self):
+        # Move the OPC worker to its own thread and wire requests/results as queued signals.
+        self.opc_thread = QThread(self)
+        self.worker = IonizerWorker("opc.tcp://DESKTOP-UH9J072:4980/Softing_dataFEED_OPC_Suite_Configuration2")
+        self.worker.moveToThread(self.opc_thread)
+
+        self.request_connect.connect(self.worker.connect_opc)
+        self.request_read.connect(self.worker.read_current)
+        self.request_shutdown.connect(self.worker.shutdown)
+
+        self.worker.connection_changed.connect(self.on_connection_changed)
+        self.worker.current_read.connect(self.on_current_read)
+        self.worker.write_done.connect(self.on_write_done)
+        self.worker.status.connect(self.status_label.setText)
+
+        self.opc_thread.start()
+
+    def start_failsafe_writer(self):
+        # Automatic failsafe saves go to a FailsafeWriter on its own thread.
+        self.failsafe_timer = QTimer(self)
+        self.failsafe_timer.setSingleShot(True)
+        self.failsafe_timer.setInterval(self.FAILSAFE_SAVE_MS)
+        self.failsafe_timer.timeout.connect(self.flush_failsafe)
+        self.saved_failsafe = None  # (path, text) the writer last confirmed on disk
+
+        self.failsafe_thread = QThread(self)
+        self.failsafe_writer = FailsafeWriter()
+        self.failsafe_writer.moveToThread(self.failsafe_thread)
+        self.request_failsafe_close.connect(self.failsafe_writer.close)
+        self.failsafe_writer.error.connect(self.on_failsafe_error)
+        self.failsafe_writer.saved.connect(self.on_failsafe_saved)
+        self.failsafe_thread.start()
 
     def init_opc(self):
-        # Establish OPC UA session (single endpoint) and update banner.
-        try:
-            self.client = Client("opc.tcp://DESKTOP-UH9J072:4980/Softing_dataFEED_OPC_Suite_Configuration2")
-            self.client.connect()
+        # Connect in the worker; on_connection_changed updates the banner.
+        self.status_label.setText("Status: Connecting...")
+        self.request_connect.emit()
+
+    def on_connection_changed(self, connected, subscribed, error):
+        # The worker retries on its own; the error dialog is shown once per outage.
+        was_connected = self.connected
+        self.connected = connected
+        self.subscribed = subscribed
+        if connected:
             self.status_label.setText("Status: Connected to OPC server")
-        except Exception as e:
-            self.status_label.setText(f"Status: Connection failed - {str(e)}")
-            QMessageBox.critical(self, "Error", f"OPC UA connection failed: {str(e)}")
+        else:
+            self.status_label.setText(f"Status: {error}")
+            if was_connected is not False:
+                QMessageBox.critical(self, "Error", f"OPC UA: {error}")
 
     def load_failsafe_with_confirmation(self):
         # On startup: if a prior setpoint file exists, optionally restore and apply it.
@@ -137,33 +438,37 @@ class IonizerCurrentControl(QMainWindow):
             return
             
         try:
-            with open(self.failsafe_file, 'r') as f:
-                value = float(f.read().strip())
-                
-                if not 0 <= value <= self.MAX_CURRENT:
-                    raise ValueError("Value out of range")
-                
-                # Confirm with operator before applying.
-                reply = QMessageBox.question(
-                    self, 'Confirm Load',
-                    f"Load previously saved current value: {value:.3f}A?",
-                    QMessageBox.Yes | QMessageBox.No
-                )
-                
-                if reply == QMessageBox.Yes:
-                    self.current_value = value
-                    if self.set_current(value):
-                        self.file_status.setText(f"Loaded: {value:.3f}A")
-                        self.status_label.setText(f"Loaded failsafe value: {value:.3f}A")
-                    else:
-                        self.file_status.setText("Load failed")
+            value = self._parse_failsafe(self.failsafe_file)
+            
+            # Confirm with operator before applying.
+            reply = QMessageBox.question(
+                self, 'Confirm Load',
+                f"Load previously saved current value: {value:.3f}A?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            
+            if reply == QMessageBox.Yes:
+                # "Loaded" is shown by report_write once the PLC accepted the value.
+                if self.set_current(value, ("failsafe", self.failsafe_file)):
+                    self.file_status.setText(f"Applying {value:.3f}A...")
                 else:
-                    self.file_status.setText("Load cancelled")
-                    self.status_label.setText("Using default 0A - load cancelled")
+                    self.file_status.setText("Load failed")
+            else:
+                self.file_status.setText("Load cancelled")
+                self.status_label.setText("Using default 0A - load cancelled")
         except Exception as e:
             QMessageBox.warning(self, "Load Error", f"Could not load failsafe: {str(e)}")
             self.create_default_failsafe()
 
+    def _parse_failsafe(self, path):
+        # Read a setpoint file; reject anything that is not a finite value within 0..MAX_CURRENT.
+        with open(path, 'r') as f:
+            raw = f.read().strip()
+        value = float(raw)
+        if not math.isfinite(value) or not 0.0 <= value <= self.MAX_CURRENT:
+            raise ValueError(f"Value {raw}A out of range (0-{self.MAX_CURRENT}A)")
+        return value
+
     def create_default_failsafe(self):
         # Create a baseline failsafe file with 0 A, and set UI accordingly.
         self.current_value = 0.0
@@ -210,12 +515,8 @@ class IonizerCurrentControl(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    value = float(f.read().strip())
-                
                 # Hard range check before applying.
-                if not 0 <= value <= self.MAX_CURRENT:
-                    raise ValueError(f"Value {value}A out of range (0-{self.MAX_CURRENT}A)")
+                value = self._parse_failsafe(file_path)
                 
                 # Confirm intent and provenance.
                 reply = QMessageBox.question(
@@ -226,50 +527,113 @@ class IonizerCurrentControl(QMainWindow):
                 )
                 
                 if reply == QMessageBox.Yes:
-                    if self.set_current(value):
-                        self.failsafe_file = file_path
-                        self.file_status.setText(f"Loaded: {value:.3f}A")
-                        self.status_label.setText(f"Loaded value from {file_path}")
-                        QMessageBox.information(self, "Success", f"Current set to {value:.3f}A")
+                    # Success is reported by report_write once the PLC accepted the value.
+                    if self.set_current(value, ("file", file_path)):
+                        self.file_status.setText(f"Applying {value:.3f}A...")
                     else:
                         QMessageBox.warning(self, "Error", "Could not set current value")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not load file: {str(e)}")
 
     def get_current(self):
-        # Read actual ionizer current (A) from OPC UA (analog input).
-        try:
-            node = self.client.get_node("ns=3;s=OPC_1.PLC_HV/Analog_In/In_Cal_Ionisierer")
-            value = node.get_value()
-            return float(str(value)) if value is not None else None
-        except Exception as e:
-            self.status_label.setText(f"Read error: {str(e)}")
-            return None
+        # Last actual ionizer current (A) read back by the worker (None if the read failed).
+        return self.actual_current
 
-    def set_current(self, value):
-        # Write ionizer current setpoint (A) to OPC UA (analog output) with range guard.
+    def on_current_read(self, value):
+        # Readback (read or push) arrived: cache it, start a waiting ramp from it, refresh the labels.
+        self.actual_current = value
+        if self.ramp_pending:
+            self.ramp_pending = False
+            self.begin_ramp()
+        self.show_current()
+
+    def show_current(self):
+        # Paint the cached readback and the active target (skipped when neither changed).
+        if self.actual_current is None:
+            return
+        shown = (self.actual_current, self.target_current)
+        if shown == self.shown_current:
+            return
+        self.shown_current = shown
+        self.current_label.setText(f"{self.actual_current:.3f}")
+        self.target_label.setText(f"{self.target_current:.3f}")
+
+    def set_current(self, value, report=None):
+        # Queue an ionizer current setpoint (A) for the worker with range guard. True only means
+        # queued: the result arrives in on_write_done, which passes `report` (load or E-stop,
+        # see report_write) on so the operator is told the real outcome.
         if not 0 <= value <= self.MAX_CURRENT:
             self.status_label.setText(f"Error: Current {value}A out of range!")
             return False
-            
-        try:
-            node = self.client.get_node("ns=3;s=OPC_1.PLC_HV/Analog_Out/Out_Cal_Ionisierer")
-            variant = ua.Variant(float(value), ua.VariantType.Float)
-            node.set_value(variant)
+
+        replaced = self.worker.post_current(float(value), report)
+        # A reported write overtaken before it was sent fails, unless this one repeats it.
+        if replaced is not None and replaced[1] is not None and replaced != (float(value), report):
+            self.report_write(replaced[0], "superseded by a newer setpoint", replaced[1])
+        return True
+
+    def on_write_done(self, value, error, report):
+        # Worker finished a setpoint write: record and persist it, or stop the ramp on failure.
+        if error:
+            self.stop_ramp()
+            self.status_label.setText(f"Write error: {error}")
+        else:
             self.current_value = value
             self.save_failsafe_automatic()
-            return True
-        except Exception as e:
-            self.status_label.setText(f"Write error: {str(e)}")
-            return False
+        if report is not None:
+            self.report_write(value, error, report)
+
+    def report_write(self, value, error, report):
+        # Tell the operator how a load or emergency-stop write ended; report is (kind, file path).
+        kind, path = report
+        if kind == "estop":
+            if error:
+                self.status_label.setText(f"EMERGENCY STOP FAILED - {error}")
+                QMessageBox.critical(self, "Error", f"EMERGENCY STOP could not set 0A: {error}")
+            else:
+                self.update_display()
+                self.status_label.setText("EMERGENCY STOP - Current set to 0A")
+                self.set_indicator_color(self.status_indicator, Qt.red)
+            return
+
+        if error:
+            self.file_status.setText("Load failed")
+            self.status_label.setText(f"Could not apply {value:.3f}A: {error}")
+            QMessageBox.warning(self, "Error", f"Could not set current value: {error}")
+            return
+        self.file_status.setText(f"Loaded: {value:.3f}A")
+        if kind == "file":
+            self.failsafe_file = path
+            self.status_label.setText(f"Loaded value from {path}")
+            QMessageBox.information(self, "Success", f"Current set to {value:.3f}A")
+        else:
+            self.status_label.setText(f"Loaded failsafe value: {value:.3f}A")
 
     def save_failsafe_automatic(self):
-        # Persist last applied current silently (used after successful writes and on exit).
-        try:
-            with open(self.failsafe_file, 'w') as f:
-                f.write(f"{self.current_value:.3f}")
-        except Exception as e:
-            self.status_label.setText(f"Autosave failed: {str(e)}")
+        # Persist last applied current silently (used after successful writes). During a ramp
+        # the steps are saved at most once per FAILSAFE_SAVE_MS; single changes (load,
+        # emergency stop, ramp end) are saved at once.
+        if self.ramp_active:
+            if not self.failsafe_timer.isActive():
+                self.failsafe_timer.start()
+        else:
+            self.flush_failsafe()
+
+    def flush_failsafe(self):
+        # Hand the value to the FailsafeWriter thread unless the file already holds it.
+        self.failsafe_timer.stop()
+        if (self.failsafe_file, f"{self.current_value:.3f}") == self.saved_failsafe:
+            return
+        self.failsafe_writer.post(self.failsafe_file, self.current_value)
+
+    def on_failsafe_saved(self, path, text):
+        # The writer confirmed the file: later saves of the same value can be skipped.
+        self.saved_failsafe = (path, text)
+
+    def on_failsafe_error(self, message):
+        # A failed save leaves the file's content unknown, so the next save must not be skipped.
+        self.saved_failsafe = None
+        self.status_label.setText(message)
 
     def toggle_ramp(self):
         # Single button toggles ramping state.
@@ -279,55 +643,71 @@ class IonizerCurrentControl(QMainWindow):
             self.start_ramp()
 
     def start_ramp(self):
-        # Configure and begin a timed ramp from current reading to target at given slope.
+        # Validate the target, then begin from a fresh readback: the pushed value when subscribed,
+        # else ask the worker for a read and let begin_ramp run when it arrives.
         self.target_current = self.target_input.value()
-        ramp_rate = self.ramp_rate_input.value()
         
         # Range guard on target.
         if not 0 <= self.target_current <= self.MAX_CURRENT:
             QMessageBox.warning(self, "Error", f"Target current must be between 0 and {self.MAX_CURRENT}A")
             return
-            
-        # Use actual measured current as start point.
+
+        if self.subscribed:
+            self.begin_ramp()
+            return
+        self.ramp_pending = True
+        self.request_read.emit()
+
+    def begin_ramp(self):
+        # Configure and begin a timed ramp from the live readback to target at given slope.
+        ramp_rate = self.ramp_rate_input.value()
+
+        # Use actual measured current as start point: current_value only holds what this window
+        # last wrote, which need not match the PLC (restore cancelled, write never applied).
         current = self.get_current()
         if current is None:
             QMessageBox.critical(self, "Error", "Could not read current value")
             return
-            
+
         delta = self.target_current - current
-        if delta == 0:
+        if round(delta, self.RAMP_DECIMALS) == 0:  # equal at the 1 mA setpoint resolution
             QMessageBox.information(self, "Info", "Already at target current")
             return
             
         direction = 1 if delta > 0 else -1
-        # Convert slope (A/min) into total ramp time (ms).
-        ramp_time = abs(delta) / ramp_rate * 60 * 1000
         
         self.ramp_active = True
         self.ramp_button.setText("Stop Ramp")
         self.set_indicator_color(self.status_indicator, Qt.yellow)
         self.status_label.setText(f"Ramping {'up' if direction > 0 else 'down'} to {self.target_current}A")
         
-        # Discretize into 100 ms steps.
-        self.ramp_steps = int(ramp_time / 100)
-        self.ramp_step_size = delta / self.ramp_steps
+        # Setpoint = start + slope * elapsed monotonic time, so a late timer tick never
+        # bends the ramp or pushes it past the selected rate.
+        self.ramp_start = current
+        self.ramp_setpoint = current
+        self.ramp_slope = direction * ramp_rate / 60.0  # A/s
+        self.ramp_t0 = time.monotonic()
         
         self.ramp_timer = QTimer(self)
         self.ramp_timer.timeout.connect(self.update_ramp)
-        self.ramp_timer.start(100)
+        self.ramp_timer.start(self.RAMP_TICK_MS)
 
     def update_ramp(self):
-        # Apply one ramp step; stop when target reached or write fails.
+        # Apply the setpoint for the elapsed ramp time; stop when target reached or write fails.
         if not self.ramp_active:
             return
             
-        new_current = self.current_value + self.ramp_step_size
+        elapsed = time.monotonic() - self.ramp_t0
+        new_current = round(self.ramp_start + self.ramp_slope * elapsed, self.RAMP_DECIMALS)
         
-        # Snap to target when crossing it.
-        if ((self.ramp_step_size > 0 and new_current >= self.target_current) or 
-            (self.ramp_step_size < 0 and new_current <= self.target_current)):
+        # Snap to target when reaching it.
+        if ((self.ramp_slope > 0 and new_current >= self.target_current) or 
+            (self.ramp_slope < 0 and new_current <= self.target_current)):
             new_current = self.target_current
             self.ramp_complete()
+        elif round(abs(new_current - self.ramp_setpoint), self.RAMP_DECIMALS) < self.WRITE_DEADBAND_A:
+            return  # write only once the setpoint moved by WRITE_DEADBAND_A since the last write
+        self.ramp_setpoint = new_current
         
         # Write step; abort ramp if write fails.
         if self.set_current(new_current):
@@ -336,16 +716,17 @@ class IonizerCurrentControl(QMainWindow):
             self.stop_ramp()
 
     def ramp_complete(self):
-        # Successful ramp end: finalize UI state and inform operator.
+        # Successful ramp end: finalize UI state and inform operator (green lamp + banner, no
+        # modal dialog, so the final write goes out at once and E-Stop stays clickable).
         self.ramp_active = False
         self.ramp_timer.stop()
         self.ramp_button.setText("Start Ramp")
         self.set_indicator_color(self.status_indicator, Qt.green)
         self.status_label.setText(f"Ramp complete! Current at {self.target_current}A")
-        QMessageBox.information(self, "Complete", "Current ramp completed successfully")
 
     def stop_ramp(self):
         # Gracefully stop an in-progress ramp (operator action or failure path).
+        self.ramp_pending = False
         if self.ramp_active:
             self.ramp_active = False
             self.ramp_timer.stop()
@@ -354,21 +735,27 @@ class IonizerCurrentControl(QMainWindow):
             self.status_label.setText("Ramp stopped by user")
 
     def emergency_stop(self):
-        # Hard stop: immediately set current to 0 A (with confirmation).
-        if QMessageBox.question(self, "Confirm", "EMERGENCY STOP - Set current to 0A?", 
-                              QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
-            self.stop_ramp()
-            if self.set_current(0.0):
-                self.update_display()
-                self.status_label.setText("EMERGENCY STOP - Current set to 0A")
-                self.set_indicator_color(self.status_indicator, Qt.red)
+        # Hard stop: freeze a running ramp at once (its timer would keep firing while the
+        # dialog is open), then set current to 0 A (with confirmation). The button is disabled
+        # until the question is answered, so repeated clicks cannot stack dialogs.
+        self.stop_ramp()
+        self.stop_button.setEnabled(False)
+        try:
+            if QMessageBox.question(self, "Confirm", "EMERGENCY STOP - Set current to 0A?", 
+                                  QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
+                # Confirmed (or not) by report_write once the write has finished.
+                if self.set_current(0.0, ("estop", None)):
+                    self.status_label.setText("EMERGENCY STOP - setting 0A...")
+        finally:
+            self.stop_button.setEnabled(True)
 
     def update_display(self):
-        # Refresh labels from live readback and show the active target.
-        current = self.get_current()
-        if current is not None:
-            self.current_label.setText(f"{current:.3f}")
-            self.target_label.setText(f"{self.target_current:.3f}")
+        # Refresh labels from live readback: pushed values are already cached, otherwise the
+        # worker reads and answers in on_current_read.
+        if self.subscribed:
+            self.show_current()
+        else:
+            self.request_read.emit()
 
     def closeEvent(self, event):
         # On exit: warn if ramping, persist last value, and disconnect OPC cleanly.
@@ -379,11 +766,21 @@ class IonizerCurrentControl(QMainWindow):
                 event.ignore()
                 return
         
-        # Save current state on exit (failsafe).
-        self.save_failsafe_automatic()
-        
-        if hasattr(self, 'client') and self.client:
-            self.client.disconnect()
+        # Disconnect in the worker; give it CLOSE_TIMEOUT_MS before cutting its socket so a
+        # dead PLC cannot hang the exit.
+        self.request_shutdown.emit()
+        if not self.opc_thread.wait(self.CLOSE_TIMEOUT_MS):
+            self.worker.abort()
+            self.opc_thread.wait()
+
+        # Save current state on exit (failsafe) and wait until it is on disk. Take the value
+        # from the stopped worker: write_done signals still queued here would arrive too late.
+        # If nothing was applied this session, the file keeps the value it already holds.
+        if self.worker.applied_current is not None:
+            self.current_value = self.worker.applied_current
+            self.flush_failsafe()
+        self.request_failsafe_close.emit()
+        self.failsafe_thread.wait()
         event.accept()
 
 
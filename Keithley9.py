@@ -5,6 +5,7 @@
 
 import socket
 import time
+import math
 import numpy as np
 from datetime import datetime
 from PyQt5 import QtWidgets, QtCore, QtGui
@@ -33,17 +34,45 @@ class GaugeWidget(QtWidgets.QWidget):
         self.text_color = QtGui.QColor(0, 0, 0)
         self.needle_color = QtGui.QColor(255, 50, 50)
 
+        # Tick geometry never changes (11 ticks, 18° apart from left to right), so the
+        # tick ends and label anchors are computed once: (index, x1, y1, x2, y2, text_x, text_y)
+        self.ticks = []
+        for i in range(0, 11):
+            rad = math.radians(180 - i * 18)
+            cos_a, sin_a = math.cos(rad), math.sin(rad)
+            self.ticks.append((i,
+                               int(round(80 * cos_a)), -int(round(80 * sin_a)),
+                               int(round(100 * cos_a)), -int(round(100 * sin_a)),
+                               int(round(70 * cos_a)), -int(round(70 * sin_a))))
+
+        # Fonts for tick labels and the centre readout, built once instead of per paint
+        self.tick_font = QtGui.QFont(self.font())
+        self.tick_font.setPointSize(6)
+        self.value_font = QtGui.QFont(self.font())
+        self.value_font.setPointSize(10)
+
+        # Repaints are coalesced: set_range/set_value only arm this timer, so a burst of
+        # updates becomes a single paint at most every 50 ms
+        self.repaint_timer = QtCore.QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.timeout.connect(self.update)
+
     def set_range(self, min_val, max_val, unit):
         # Change scale and unit together (called when range buttons change)
         self.min_value = min_val
         self.max_value = max_val
         self.unit = unit
-        self.update()
+        self.schedule_repaint()
 
     def set_value(self, value):
         # Update the instantaneous value shown on the gauge
         self.value = value
-        self.update()
+        self.schedule_repaint()
+
+    def schedule_repaint(self):
+        # Arm the repaint timer unless a repaint is already pending
+        if not self.repaint_timer.isActive():
+            self.repaint_timer.start(50)
 
     def paintEvent(self, event):
         # Custom paint: draw a semicircular dial, ticks, value arc, needle, and numeric text
@@ -84,10 +113,10 @@ class GaugeWidget(QtWidgets.QWidget):
                         int((value_angle - start_angle) * 16))
 
         # Needle pointing to current angle
-        needle_angle = np.radians(value_angle)
+        needle_angle = math.radians(value_angle)
         needle_length = 80
-        x = int(round(needle_length * np.cos(needle_angle)))
-        y = int(round(needle_length * np.sin(needle_angle)))
+        x = int(round(needle_length * math.cos(needle_angle)))
+        y = int(round(needle_length * math.sin(needle_angle)))
 
         painter.setPen(QtGui.QPen(self.needle_color, 2))
         painter.setBrush(self.needle_color)
@@ -96,32 +125,17 @@ class GaugeWidget(QtWidgets.QWidget):
 
         # Major/minor ticks + numeric labels
         painter.setPen(QtGui.QPen(self.text_color, 2))
-        for i in range(0, 11):
-            angle = start_angle - (i * (span_angle / 10))
-            rad = np.radians(angle)
-            inner = 80
-            outer = 100
-
-            x1 = int(round(inner * np.cos(rad)))
-            y1 = int(round(inner * np.sin(rad)))
-            x2 = int(round(outer * np.cos(rad)))
-            y2 = int(round(outer * np.sin(rad)))
-            painter.drawLine(x1, -y1, x2, -y2)
+        painter.setFont(self.tick_font)
+        for i, x1, y1, x2, y2, text_x, text_y in self.ticks:
+            painter.drawLine(x1, y1, x2, y2)
 
             if i % 2 == 0:
                 value = self.min_value + (i / 10) * (self.max_value - self.min_value)
                 text = f"{value:.0f}" if (self.max_value - self.min_value) > 10 else f"{value:.1f}"
-                text_x = int(round((outer - 30) * np.cos(rad)))
-                text_y = int(round((outer - 30) * np.sin(rad)))
-                font = painter.font()
-                font.setPointSize(6)
-                painter.setFont(font)
-                painter.drawText(QtCore.QPointF(text_x, -text_y), text)
+                painter.drawText(QtCore.QPointF(text_x, text_y), text)
 
         # Numeric readout at center
-        font = painter.font()
-        font.setPointSize(10)
-        painter.setFont(font)
+        painter.setFont(self.value_font)
         painter.setPen(QtGui.QPen(self.text_color))
         value_text = f"{self.value:.2f} {self.unit}"
         painter.drawText(QtCore.QRectF(-40, -30, 80, 20),
@@ -151,9 +165,11 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
             (0, 1, "µA"), (0, 3, "µA"), (0, 10, "µA"), (0, 30, "µA")
         ]
 
-        # Time series buffers (nA, seconds); integrated charge tracked in nC via trapezoidal rule
-        self.timestamps = []
-        self.measurements_nA = []
+        # Time series buffers (seconds, nA): preallocated arrays filled up to sample_count and
+        # doubled when full; integrated charge tracked in nC via trapezoidal rule
+        self.timestamps = np.empty(1024, dtype=np.float64)
+        self.measurements_nA = np.empty(1024, dtype=np.float64)
+        self.sample_count = 0
         self.charge_nC = 0.0
         self.filter_threshold = 100000  # 100 µA expressed as nA
         self.plot_start_time = 0
@@ -290,6 +306,11 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
         self.figure = Figure(figsize=(10, 4), dpi=100)
         self.canvas = FigureCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
+        # One persistent line; update_plot only swaps its data and limits
+        self.plot_line, = self.ax.plot([], [], 'b-')
+        self.ax.set_xlabel('Elapsed Time (s)')
+        self.ax.set_ylabel('Current (nA)', color='b')
+        self.ax.grid(True)
         layout.addWidget(self.canvas)
 
         main_tab.setLayout(layout)
@@ -301,10 +322,10 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
 
     def calculate_moving_stats(self):
         # Compute mean/std over last N samples; returns (avg, sigma) or (None, None)
-        if len(self.measurements_nA) == 0:
+        if self.sample_count == 0:
             return None, None
-        n = min(self.window_size, len(self.measurements_nA))
-        last_n = self.measurements_nA[-n:]
+        n = min(self.window_size, self.sample_count)
+        last_n = self.measurements_nA[self.sample_count - n:self.sample_count]
         avg = np.mean(last_n)
         sigma = np.std(last_n)
         return avg, sigma
@@ -340,8 +361,8 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
 
     def clear_graph(self):
         # Reset the visible time origin while continuing acquisition
-        if self.is_measuring and len(self.timestamps) > 0:
-            self.plot_start_time = self.timestamps[-1]
+        if self.is_measuring and self.sample_count > 0:
+            self.plot_start_time = self.timestamps[self.sample_count - 1]
             self.update_plot()
 
     def set_range(self, index):
@@ -351,8 +372,8 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
         for i, btn in enumerate(self.range_buttons):
             btn.setChecked(i == index)
         self.gauge.set_range(min_val, max_val, unit)
-        if self.measurements_nA:
-            self.update_gauge(self.measurements_nA[-1])
+        if self.sample_count > 0:
+            self.update_gauge(self.measurements_nA[self.sample_count - 1])
 
     def update_gauge(self, current_nA):
         # Convert nA to the active unit and clamp to displayable range
@@ -400,8 +421,7 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
                     print(f"OPC UA connection failed: {opc_error}")
 
                 # Reset buffers and timing
-                self.timestamps = []
-                self.measurements_nA = []
+                self.sample_count = 0
                 self.charge_nC = 0.0
                 self.start_time = time.time()
                 self.plot_start_time = 0
@@ -498,13 +518,13 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
                 # Trapezoid area: ((I_prev + I_now)/2) * dt ; since values are in nA and dt in s, result is nC
-                if len(self.timestamps) > 0:
-                    dt = elapsed - self.timestamps[-1]
-                    self.charge_nC += (self.measurements_nA[-1] + current_nA) / 2 * dt
+                if self.sample_count > 0:
+                    last = self.sample_count - 1
+                    dt = elapsed - self.timestamps[last]
+                    self.charge_nC += (self.measurements_nA[last] + current_nA) / 2 * dt
 
                 # Append and compute rolling stats
-                self.timestamps.append(elapsed)
-                self.measurements_nA.append(current_nA)
+                self.append_sample(elapsed, current_nA)
                 avg, sigma = self.calculate_moving_stats()
 
                 # UI updates
@@ -531,21 +551,31 @@ class KeithleyMonitor(QtWidgets.QMainWindow):
             self.clear_button.setEnabled(False)
             QtWidgets.QMessageBox.critical(self, "Error", f"Measurement failed: {str(e)}")
 
+    def append_sample(self, elapsed, current_nA):
+        # Store one sample, doubling both buffers when they are full
+        if self.sample_count == len(self.timestamps):
+            self.timestamps = np.concatenate((self.timestamps, np.empty_like(self.timestamps)))
+            self.measurements_nA = np.concatenate((self.measurements_nA, np.empty_like(self.measurements_nA)))
+        self.timestamps[self.sample_count] = elapsed
+        self.measurements_nA[self.sample_count] = current_nA
+        self.sample_count += 1
+
     def update_plot(self):
-        # Redraw line plot for data after the last clear; auto-scale axes
-        self.ax.clear()
-        if len(self.timestamps) > 0:
-            plot_times = [t - self.plot_start_time for t in self.timestamps if t >= self.plot_start_time]
-            plot_values = [v for t, v in zip(self.timestamps, self.measurements_nA) if t >= self.plot_start_time]
-            if plot_times:
-                self.ax.plot(plot_times, plot_values, 'b-')
-                self.ax.set_xlabel('Elapsed Time (s)')
-                self.ax.set_ylabel('Current (nA)', color='b')
-                self.ax.grid(True)
-                if len(plot_times) > 1:
-                    self.ax.set_xlim(min(plot_times), max(plot_times))
-                    self.ax.set_ylim(0, max(plot_values) * 1.1)
-        self.canvas.draw()
+        # Show data after the last clear on the persistent line; auto-scale axes.
+        # Timestamps are increasing, so the visible window starts at a binary-searched index.
+        first = np.searchsorted(self.timestamps[:self.sample_count], self.plot_start_time)
+        plot_times = self.timestamps[first:self.sample_count] - self.plot_start_time
+        plot_values = self.measurements_nA[first:self.sample_count]
+        self.plot_line.set_data(plot_times, plot_values)
+        if len(plot_times) > 1:
+            self.ax.set_xlim(plot_times[0], plot_times[-1])
+            self.ax.set_ylim(0, plot_values.max() * 1.1)
+        else:
+            # Too few points to span an axis: drop the previous run's limits and autoscale
+            # (set_xlim/set_ylim above switched autoscaling off)
+            self.ax.relim()
+            self.ax.autoscale(True)
+        self.canvas.draw_idle()
 
     def closeEvent(self, event):
         # Cleanly stop acquisition and close all connections on exit